@@ -1,4 +1,6 @@
 # sentiment_app.py
+import os
+import sys
 import pandas as pd
 import numpy as np
 import re
@@ -14,6 +16,9 @@ from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.svm import SVC
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+from historical_store import HistoricalStore
+
 # -------------------------------
 # Data Preprocessing Functions
 # -------------------------------
@@ -37,7 +42,7 @@ def clean_text(text):
 # -------------------------------
 @st.cache_resource  # cache so retraining doesn't happen on every reload
 def train_models():
-    df = pd.read_csv("market_sentiment_500.csv")
+    df = HistoricalStore().load(columns=["title/text", "sentiment"])
     df["sentiment_label"] = df["sentiment"].apply(label_sentiment)
     df["clean_text"] = df["title/text"].astype(str).apply(clean_text)
 
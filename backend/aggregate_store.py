@@ -0,0 +1,124 @@
+import threading
+
+import pandas as pd
+
+from trend_store import MARKET_KEY
+
+MACRO_METRICS = ('unemployment_rate', 'cpi', 'sp500')
+
+
+def _accumulate(table, key, value, count=1):
+    """Add a value to a [sum, count] running total"""
+    entry = table.get(key)
+    if entry is None:
+        table[key] = [value, count]
+    else:
+        entry[0] += value
+        entry[1] += count
+
+
+class SentimentAggregateStore:
+    """Running sums and counts per (hour, source, type, symbol) that grow with buckets, not rows"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}  # (hour, source, type, symbol) -> [sentiment sum, count]
+        self._hourly = {}  # symbol -> {hour: [sentiment sum, count]}
+        self._daily = {}  # date -> {metric: [sum, count]}
+        self._sources = {}  # source -> [sentiment sum, count]
+        self._macro = {metric: [0.0, 0] for metric in MACRO_METRICS}
+        self._dirty = set()
+        self.version = 0
+
+    def add(self, timestamp, source, type_, sentiment, symbol=MARKET_KEY, **macro):
+        """Fold one observation into every running aggregate in O(1)"""
+        hour = timestamp.replace(minute=0, second=0, microsecond=0)
+        with self._lock:
+            self._add_locked(hour, source, type_, symbol, sentiment, 1, macro)
+            self.version += 1
+
+    def _add_locked(self, hour, source, type_, symbol, sentiment_sum, count, macro):
+        _accumulate(self._buckets, (hour, source, type_, symbol), sentiment_sum, count)
+        _accumulate(self._hourly.setdefault(symbol, {}), hour, sentiment_sum, count)
+        _accumulate(self._sources, source, sentiment_sum, count)
+        daily = self._daily.setdefault(hour.date(), {})
+        _accumulate(daily, 'sentiment', sentiment_sum, count)
+        for metric, (metric_sum, metric_count) in macro.items():
+            if metric_count:
+                _accumulate(daily, metric, metric_sum, metric_count)
+                _accumulate(self._macro, metric, metric_sum, metric_count)
+        self._dirty.add(symbol)
+
+    def add_frame(self, df, symbol=MARKET_KEY):
+        """Bulk-load historical rows with one vectorized groupby"""
+        frame = df.assign(hour=df['timestamp'].dt.floor('60min'))
+        columns = ['sentiment', *MACRO_METRICS]
+        grouped = frame.groupby(['hour', 'source', 'type'], observed=True)[columns].agg(['sum', 'count'])
+
+        with self._lock:
+            for (hour, source, type_), row in grouped.iterrows():
+                macro = {metric: (row[(metric, 'sum')], row[(metric, 'count')]) for metric in MACRO_METRICS}
+                self._add_locked(hour.to_pydatetime(), source, type_, symbol,
+                                 row[('sentiment', 'sum')], int(row[('sentiment', 'count')]), macro)
+            self.version += 1
+
+    def add_live_items(self, symbol, type_, items):
+        """Append newly collected scored articles or posts"""
+        now = pd.Timestamp.now(tz='UTC').tz_localize(None)
+        added = 0
+        for item in items:
+            score = item.get('raw_sentiment_score', item.get('sentiment_score'))
+            if score is None:
+                continue
+            timestamp = now
+            if item.get('publishedAt'):
+                timestamp = pd.Timestamp(item['publishedAt'])
+                if timestamp.tzinfo is not None:
+                    timestamp = timestamp.tz_convert(None)  # Naive UTC, like the historical data
+            elif item.get('created_utc'):
+                timestamp = pd.Timestamp(item['created_utc'], unit='s')
+            source = item.get('source') or (f"r/{item['subreddit']}" if item.get('subreddit') else type_)
+            # Float epochs parse with nanoseconds, which to_pydatetime would drop with a UserWarning
+            self.add(timestamp.floor('us').to_pydatetime(), source, type_, float(score), symbol)
+            added += 1
+        return added
+
+    def take_dirty(self, symbol):
+        """Whether a symbol's series changed since the last call, clearing the flag"""
+        with self._lock:
+            if symbol in self._dirty:
+                self._dirty.discard(symbol)
+                return True
+            return False
+
+    def hourly_frame(self, symbol=MARKET_KEY):
+        """Hourly sentiment sums and counts for a symbol, including market-wide history"""
+        with self._lock:
+            combined = dict((hour, list(entry)) for hour, entry in self._hourly.get(MARKET_KEY, {}).items())
+            if symbol != MARKET_KEY:
+                for hour, (total, count) in self._hourly.get(symbol, {}).items():
+                    _accumulate(combined, hour, total, count)
+        frame = pd.DataFrame.from_dict(combined, orient='index', columns=['sum', 'count'])
+        frame.index = pd.DatetimeIndex(frame.index)
+        return frame.sort_index()
+
+    def daily_means(self):
+        """Daily mean of sentiment and macro metrics, oldest first"""
+        with self._lock:
+            days = sorted(self._daily.items())
+            return [
+                dict({'date': str(date)}, **{
+                    metric: total / count for metric, (total, count) in metrics.items() if count
+                })
+                for date, metrics in days
+            ]
+
+    def source_means(self):
+        """Mean sentiment per source"""
+        with self._lock:
+            return {source: total / count for source, (total, count) in self._sources.items() if count}
+
+    def macro_averages(self):
+        """Overall averages of the macro indicators"""
+        with self._lock:
+            return {metric: total / count for metric, (total, count) in self._macro.items() if count}
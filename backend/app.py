@@ -1,14 +1,23 @@
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, Response
 from flask_cors import CORS
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import os
-import re
 from collections import Counter
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from live_data_collector import LiveDataCollector
 from ml_sentiment_predictor import MarketSentimentPredictor
+from scoring_pipeline import ScoringPipeline
+from model_store import ModelArtifactStore
+from online_trainer import OnlineSentimentTrainer
+from sentiment_cache import SymbolCache
+from prefetch_scheduler import PrefetchScheduler
+from trend_store import TrendStore, MARKET_KEY
+from aggregate_store import SentimentAggregateStore
+from historical_store import HistoricalStore
+from word_trends import WindowedTermTracker, WINDOWS, ALL_SYMBOLS, extract_terms
+from event_stream import EventBroker
+from http_cache import ResponseCache, json_response
 import threading
 import time
 
@@ -18,162 +27,226 @@ CORS(app)  # Enable CORS for React frontend
 # Initialize sentiment analyzer
 analyzer = SentimentIntensityAnalyzer()
 
-# Initialize live data collector and ML predictor
-live_collector = LiveDataCollector()
+# Initialize ML predictor and the live data collector that scores items with it
 ml_predictor = MarketSentimentPredictor()
+live_collector = LiveDataCollector(scoring_pipeline=ScoringPipeline(ml_predictor))
+model_store = ModelArtifactStore()
 
-# Global cache for live sentiment data - reduced cache time for demo
-live_sentiment_cache = {
-    'data': None,
-    'timestamp': None,
-    'cache_duration': 60  # 1 minute for dynamic updates
-}
+# Optional incremental learning from collected live data
+online_trainer = None
+if os.getenv('ONLINE_LEARNING', 'false').lower() == 'true':
+    online_trainer = OnlineSentimentTrainer(
+        ml_predictor,
+        batch_size=int(os.getenv('ONLINE_BATCH_SIZE', 32)),
+        publish_every=int(os.getenv('ONLINE_PUBLISH_EVERY', 10))
+    )
+    live_collector.add_observer(online_trainer.add_scored_items)
+
+# Per-symbol cache for live sentiment data - short TTL for dynamic updates, stale entries
+# are served while a single background fetch refreshes them
+sentiment_cache = SymbolCache(
+    max_entries=int(os.getenv('SENTIMENT_CACHE_SIZE', 100)),
+    ttl_seconds=float(os.getenv('SENTIMENT_CACHE_TTL', 60)),
+    stale_seconds=float(os.getenv('SENTIMENT_CACHE_STALE_SECONDS', 300))
+)
+
+# Newest historical rows kept in memory per type for the CSV fallbacks
+RECENT_HISTORY_ROWS = int(os.getenv('RECENT_HISTORY_ROWS', 100))
 
 class MarketSentimentAPI:
     def __init__(self):
-        # Load the sentiment data
-        csv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'market_sentiment_500.csv')
-        self.df = pd.read_csv(csv_path)
-        self.df['timestamp'] = pd.to_datetime(self.df['timestamp'])
+        self.trend_store = TrendStore()
         self.process_data()
     
     def process_data(self):
-        """Process the raw sentiment data for API consumption"""
-        # Sort by timestamp
-        self.df = self.df.sort_values('timestamp')
-        
-        # Calculate daily aggregates
-        self.df['date'] = self.df['timestamp'].dt.date
-        self.daily_sentiment = self.df.groupby('date').agg({
-            'sentiment': 'mean',
-            'unemployment_rate': 'mean',
-            'cpi': 'mean',
-            'sp500': 'mean'
-        }).reset_index()
-        
-        # Convert date to string for JSON serialization
-        self.daily_sentiment['date'] = self.daily_sentiment['date'].astype(str)
+        """Process the historical sentiment data for API consumption, one month partition at a time"""
+        # Running aggregates per (hour, source, type, symbol); live observations are appended later
+        self.aggregates = SentimentAggregateStore()
+        word_counts = Counter()
+        recent = None
+        for month in HistoricalStore().iter_months():
+            month = month.sort_values('timestamp')
+            self.aggregates.add_frame(month)
+            word_counts.update(extract_terms(' '.join(month[month['type'] == 'news']['title/text'].astype(str))))
+            
+            # Only the newest rows of each type stay resident; the rest of the history lives in the aggregates
+            recent = month if recent is None else pd.concat([recent, month], ignore_index=True)
+            recent = recent.groupby('type', observed=True).tail(RECENT_HISTORY_ROWS)
+        self.recent_df = recent
         
-        # Calculate sentiment by source type
-        self.source_sentiment = self.df.groupby('source')['sentiment'].mean().to_dict()
+        # Precompute trend series at every resolution
+        self.trend_store.rebuild_from_hourly(self.aggregates.hourly_frame())
+        self.aggregates.take_dirty(MARKET_KEY)
         
         # Generate word cloud from news titles
-        self.generate_word_cloud()
+        self.generate_word_cloud(word_counts)
+    
+    @property
+    def daily_sentiment(self):
+        """Daily sentiment and macro means, including live observations"""
+        return pd.DataFrame(self.aggregates.daily_means())
+    
+    @property
+    def source_sentiment(self):
+        """Mean sentiment per source, including live observations"""
+        return self.aggregates.source_means()
+    
+    def ingest_live_items(self, symbol, source, items):
+        """Collector observer: fold live articles and posts into the running aggregates"""
+        self.aggregates.add_live_items(symbol, source, items)
+    
+    def load_article_history(self, article_store, days=30):
+        """Fold stored live articles and posts from earlier runs into the aggregates"""
+        since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%dT%H:%M:%S')
+        grouped = {}
+        for symbol, source, record in article_store.history(since):
+            grouped.setdefault((symbol, source), []).append(record)
+        for (symbol, source), records in grouped.items():
+            self.aggregates.add_live_items(symbol, source, records)
+        return sum(len(records) for records in grouped.values())
+    
+    def refresh_trend(self, symbol):
+        """Rebuild a symbol's trend series only if new observations arrived for it"""
+        if self.aggregates.take_dirty(symbol):
+            self.trend_store.rebuild_from_hourly(self.aggregates.hourly_frame(symbol), symbol)
     
-    def generate_word_cloud(self):
-        """Extract key words from news titles for word cloud"""
-        # Combine all news titles
-        news_text = ' '.join(self.df[self.df['type'] == 'news']['title/text'].astype(str))
+    def generate_word_cloud(self, word_counts):
+        """Key words of the historical news titles for the word cloud"""
+        # Get most common words
+        self.word_cloud = [word for word, count in word_counts.most_common(20)]
         
-        # Simple word extraction (remove common words)
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'as', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should'}
+        # Streaming top terms from live titles, per symbol and time window
+        self.term_tracker = WindowedTermTracker()
+    
+    def get_word_cloud(self, symbol=None, window='24h', count=20, with_counts=False):
+        """Top live terms for a symbol (or across symbols) and window, falling back to the historical word cloud"""
+        terms = self.term_tracker.top_terms(symbol.upper() if symbol else ALL_SYMBOLS, window, count)
+        if not terms:
+            return [{'word': word, 'count': None} for word in self.word_cloud] if with_counts else self.word_cloud
+        if with_counts:
+            return [{'word': word, 'count': word_count} for word, word_count in terms]
+        return [word for word, _ in terms]
+    
+    def get_sentiment_trend(self, symbol='AAPL', days=30, resolution=None):
+        """Get sentiment trend for the last N days on a 0-100 scale"""
+        symbol = symbol.upper()
+        self.refresh_trend(symbol)
+        return self.trend_store.query(symbol, days, resolution)
+    
+    def fetch_live_sentiment(self, symbol):
+        """Fetch live data for a symbol and score it with the ML model"""
+        print(f"Fetching fresh live sentiment data for {symbol}...")
         
-        # Extract words (simple regex)
-        words = re.findall(r'\b[a-zA-Z]{4,}\b', news_text.lower())
-        words = [word for word in words if word not in stop_words]
+        # Get live data from all sources
+        live_data = live_collector.get_comprehensive_sentiment(symbol)
         
-        # Get most common words
-        word_counts = Counter(words)
-        self.word_cloud = [word for word, count in word_counts.most_common(20)]
+        # Use ML model to analyze the data if available
+        if ml_predictor.is_trained:
+            ml_scores = ml_predictor.analyze_live_data(
+                live_data.get('news_articles', []),
+                live_data.get('social_posts', []),
+                live_data.get('economic_indicators', {})
+            )
+            
+            # Use ML predictions
+            return self.ml_sentiment(ml_scores, live_data)
+        
+        # Use live collector scores as fallback
+        return self.collector_sentiment(live_data)
     
-    def get_sentiment_trend(self, symbol='AAPL', days=30):
-        """Get sentiment trend for the last N days"""
-        print(f"Getting trend data for {symbol} with {days} days")  # Debug log
+    def ml_sentiment(self, ml_scores, live_data):
+        """Scores from the ML model, with the freshness of the data behind them"""
+        return {
+            'overall': ml_scores['overall'],
+            'social': ml_scores['social'],
+            'news': ml_scores['news'],
+            'econ': ml_scores['economic'],
+            **self.source_freshness(live_data)
+        }
+    
+    def collector_sentiment(self, live_data):
+        """Scores as computed by the live collector itself"""
+        return {
+            'overall': live_data['overall'],
+            'social': live_data['social'], 
+            'news': live_data['news'],
+            'econ': live_data['economic'],
+            **self.source_freshness(live_data)
+        }
+    
+    def source_freshness(self, live_data):
+        """Sources served from their last good value (age in seconds) or degraded to a neutral score"""
+        return {
+            'stale_sources': live_data.get('stale_sources', {}),
+            'degraded_sources': live_data.get('degraded_sources', [])
+        }
+    
+    def get_sentiment_batch(self, symbols):
+        """Current sentiment for many symbols; returns (scores by symbol, symbols that timed out)
         
-        # Get recent data based on days requested
-        recent_data = self.daily_sentiment.tail(days)
-        print(f"Retrieved {len(recent_data)} data points for {days} days")  # Debug log
+        Fresh cache entries are served as is. The rest share one economic fetch and one model batch.
+        """
+        results = {}
+        pending = []
+        for symbol in symbols:
+            prefetch_scheduler.record_request(symbol)
+            age = sentiment_cache.age(symbol)
+            if age is not None and age < sentiment_cache.ttl_seconds:
+                results[symbol] = sentiment_cache.get(symbol, lambda symbol=symbol: self.fetch_live_sentiment(symbol))
+            else:
+                pending.append(symbol)
         
-        # Convert sentiment to 0-100 scale
-        trend_data = []
-        for _, row in recent_data.iterrows():
-            # Convert sentiment from -1,1 to 0,100 scale
-            score = max(0, min(100, (row['sentiment'] + 1) * 50))
-            trend_data.append({
-                'date': row['date'],
-                'score': round(score, 2)
-            })
+        if not pending:
+            return results, []
         
-        # Add some variation based on time range for more distinct visualization
-        if days <= 7:
-            # For week view, add more volatility
-            for point in trend_data:
-                point['score'] = max(0, min(100, point['score'] + np.random.normal(0, 5)))
-        elif days >= 365:
-            # For year view, smooth out the data
-            for point in trend_data:
-                point['score'] = max(0, min(100, point['score'] + np.random.normal(0, 2)))
+        live_results, timed_out = live_collector.get_batch_sentiment(pending)
+        fetched = list(live_results)
+        if ml_predictor.is_trained:
+            batches = [
+                (
+                    live_results[symbol].get('news_articles', []),
+                    live_results[symbol].get('social_posts', []),
+                    live_results[symbol].get('economic_indicators', {})
+                )
+                for symbol in fetched
+            ]
+            for symbol, ml_scores in zip(fetched, ml_predictor.analyze_live_data_many(batches)):
+                results[symbol] = self.ml_sentiment(ml_scores, live_results[symbol])
+        else:
+            for symbol in fetched:
+                results[symbol] = self.collector_sentiment(live_results[symbol])
         
-        print(f"Returning {len(trend_data)} trend points")  # Debug log
-        return trend_data
+        for symbol in fetched:
+            sentiment_cache.set(symbol, results[symbol])
+        return results, timed_out
     
     def get_current_sentiment(self, symbol='AAPL'):
         """Get current sentiment scores using live data and ML predictions"""
-        global live_sentiment_cache
-        
-        # Check if we have cached live data that's still fresh
-        current_time = datetime.now()
-        if (live_sentiment_cache['data'] is not None and 
-            live_sentiment_cache['timestamp'] is not None and
-            (current_time - live_sentiment_cache['timestamp']).seconds < live_sentiment_cache['cache_duration']):
-            
-            print("Using cached live sentiment data")
-            return live_sentiment_cache['data']
-        
-        print("Fetching fresh live sentiment data...")
+        symbol = symbol.upper()
+        prefetch_scheduler.record_request(symbol)
         
         try:
-            # Get live data from all sources
-            live_data = live_collector.get_comprehensive_sentiment(symbol)
-            
-            # Use ML model to analyze the data if available
-            if ml_predictor.is_trained:
-                ml_scores = ml_predictor.analyze_live_data(
-                    live_data.get('news_articles', []),
-                    live_data.get('social_posts', []),
-                    live_data.get('economic_indicators', {})
-                )
-                
-                # Use ML predictions
-                sentiment_data = {
-                    'overall': ml_scores['overall'],
-                    'social': ml_scores['social'],
-                    'news': ml_scores['news'],
-                    'econ': ml_scores['economic']
-                }
-            else:
-                # Use live collector scores as fallback
-                sentiment_data = {
-                    'overall': live_data['overall'],
-                    'social': live_data['social'], 
-                    'news': live_data['news'],
-                    'econ': live_data['economic']
-                }
-            
-            # Cache the results
-            live_sentiment_cache['data'] = sentiment_data
-            live_sentiment_cache['timestamp'] = current_time
-            
-            return sentiment_data
+            # Concurrent misses for the same symbol share a single upstream fetch
+            return sentiment_cache.get(symbol, lambda: self.fetch_live_sentiment(symbol))
             
         except Exception as e:
             print(f"Error getting live sentiment: {e}")
             # Fallback to CSV data
-            recent_news = self.df[self.df['type'] == 'news'].tail(10)
-            recent_social = self.df[self.df['type'] == 'twitter'].tail(10)
+            recent_news = self.recent_df[self.recent_df['type'] == 'news'].tail(10)
+            recent_social = self.recent_df[self.recent_df['type'] == 'twitter'].tail(10)
             
             # Calculate averages
-            news_sentiment = recent_news['sentiment'].mean()
-            social_sentiment = recent_social['sentiment'].mean()
+            news_sentiment = float(recent_news['sentiment'].mean())
+            social_sentiment = float(recent_social['sentiment'].mean())
             
             # Get economic indicators from most recent data
-            latest_econ = self.df.tail(1).iloc[0]
+            latest_econ = self.recent_df.tail(1).iloc[0]
             
             # Convert to 5-point scale
             overall = ((news_sentiment + social_sentiment) / 2 + 1) * 2.5
             social = (social_sentiment + 1) * 2.5
             news = (news_sentiment + 1) * 2.5
-            econ = min(5, max(1, 3 + (latest_econ['cpi'] - 280) / 20))
+            econ = min(5, max(1, 3 + (float(latest_econ['cpi']) - 280) / 20))
             
             return {
                 'overall': round(overall, 2),
@@ -182,13 +255,14 @@ class MarketSentimentAPI:
                 'econ': round(econ, 2)
             }
     
-    def get_latest_news(self, count=6):
-        """Get latest news with sentiment using live data"""
+    def get_latest_news(self, count=6, symbol=None):
+        """Get latest news with sentiment using live data, for one symbol or across symbols"""
         try:
-            # Try to get live news data
-            if hasattr(live_collector, 'news_data') and live_collector.news_data:
-                live_news = live_collector.news_data[:count]
-                
+            # The symbol's last published fetch, else the newest stored live articles
+            live_news = list(live_collector.snapshot(symbol.upper())['news'][:count]) if symbol else []
+            if not live_news:
+                live_news = live_collector.article_store.recent('news', count, symbol and symbol.upper())
+            if live_news:
                 news_list = []
                 for i, article in enumerate(live_news):
                     sentiment_label = "POS" if article.get('sentiment_score', 0) > 0 else "NEG"
@@ -209,7 +283,7 @@ class MarketSentimentAPI:
             print(f"Error getting live news: {e}")
         
         # Fallback to CSV data
-        news_data = self.df[self.df['type'] == 'news'].tail(count)
+        news_data = self.recent_df[self.recent_df['type'] == 'news'].tail(count)
         
         news_list = []
         for _, row in news_data.iterrows():
@@ -220,16 +294,18 @@ class MarketSentimentAPI:
                 'source': row['source'],
                 'time': row['timestamp'].strftime('%Y-%m-%d %H:%M'),
                 'sentiment': sentiment_label,
-                'sentiment_score': row['sentiment'],
+                'sentiment_score': float(row['sentiment']),
                 'snippet': f"Economic indicators: CPI {row['cpi']:.1f}, Unemployment {row['unemployment_rate']:.1f}%"
             })
         
         return news_list
     
-    def get_recommendation(self, symbol='AAPL'):
+    def get_recommendation(self, symbol='AAPL', sentiment=None, trend_data=None):
         """Generate buy/sell recommendation based on overall sentiment analysis (2-5 scale)"""
-        sentiment = self.get_current_sentiment(symbol)
-        trend_data = self.get_sentiment_trend(symbol, days=7)
+        if sentiment is None:
+            sentiment = self.get_current_sentiment(symbol)
+        if trend_data is None:
+            trend_data = self.get_sentiment_trend(symbol, days=7, resolution='daily')
         
         # Calculate trend direction from recent data
         recent_scores = [point['score'] for point in trend_data[-5:]] if len(trend_data) >= 5 else []
@@ -316,9 +392,75 @@ class MarketSentimentAPI:
                 'economic': sentiment['econ']
             }
         }
+    
+    def get_dashboard(self, symbol='AAPL', days=30, news_count=8, window='24h'):
+        """Every dashboard section computed from one sentiment snapshot"""
+        symbol = symbol.upper()
+        
+        # One cache lookup; the recommendation reuses the same scores instead of refetching
+        sentiment = self.get_current_sentiment(symbol)
+        trend = self.get_sentiment_trend(symbol, days)
+        recommendation = self.get_recommendation(
+            symbol,
+            sentiment=sentiment,
+            trend_data=self.get_sentiment_trend(symbol, days=7, resolution='daily')
+        )
+        
+        return {
+            'symbol': symbol,
+            'generated_at': datetime.now().isoformat(),
+            'sentiment': sentiment,
+            'trend': trend,
+            'news': self.get_latest_news(news_count, symbol),
+            'wordcloud': self.get_word_cloud(symbol, window),
+            'recommendation': recommendation
+        }
+
+# Precomputed bodies for rarely changing endpoints, revalidated with ETags
+response_cache = ResponseCache(
+    max_entries=int(os.getenv('RESPONSE_CACHE_SIZE', 512)),
+    min_size=int(os.getenv('COMPRESS_MIN_BYTES', 1024))
+)
 
 # Initialize the API
 api = MarketSentimentAPI()
+live_collector.add_observer(api.ingest_live_items)
+api.load_article_history(live_collector.article_store, days=int(os.getenv('ARTICLE_HISTORY_DAYS', 30)))
+live_collector.add_observer(api.term_tracker.add_live_items)
+
+# Server-sent event channel, subscribers grouped by symbol
+event_broker = EventBroker(heartbeat_seconds=float(os.getenv('STREAM_HEARTBEAT_SECONDS', 15)))
+
+# Trend ranges (days) pushed with each update, matching the dashboard's range selector
+STREAM_TREND_DAYS = (7, 30, 90, 365)
+
+def prefetch_symbol(symbol):
+    """Refresh a symbol's live sentiment straight into the serving cache and push what changed"""
+    sentiment = api.fetch_live_sentiment(symbol)
+    sentiment_cache.set(symbol, sentiment)
+    event_broker.publish_snapshot(symbol, {
+        'sentiment': sentiment,
+        # Every range the dashboard offers, so a pushed trend never waits for the client to ask
+        'trend': {str(days): api.get_sentiment_trend(symbol, days) for days in STREAM_TREND_DAYS},
+        'news': api.get_latest_news(8, symbol),
+        'wordcloud': api.get_word_cloud(symbol),
+        'recommendation': api.get_recommendation(
+            symbol,
+            sentiment=sentiment,
+            trend_data=api.get_sentiment_trend(symbol, days=7, resolution='daily')
+        )
+    })
+
+# Background refresh of every configured symbol so requests never wait on upstream APIs
+PREFETCH_ENABLED = os.getenv('PREFETCH_ENABLED', 'true').lower() == 'true'
+prefetch_scheduler = PrefetchScheduler(
+    live_collector.company_map.keys(),
+    prefetch_symbol,
+    interval_seconds=float(os.getenv('PREFETCH_INTERVAL_SECONDS', 45)),
+    spacing_seconds=float(os.getenv('PREFETCH_SPACING_SECONDS', 3)),
+    # Extra tickers requests may add to the rotation besides the configured companies
+    allowed_symbols=[symbol.strip().upper() for symbol in os.getenv('PREFETCH_ALLOWED_SYMBOLS', '').split(',') if symbol.strip()]
+)
 
 @app.route('/api/sentiment/<symbol>')
 def get_sentiment(symbol):
@@ -330,20 +472,92 @@ def get_sentiment(symbol):
 def get_trend(symbol):
     """Get sentiment trend for a symbol"""
     days = request.args.get('days', 30, type=int)
-    trend = api.get_sentiment_trend(symbol, days)
-    return jsonify(trend)
+    resolution = request.args.get('resolution')
+    symbol = symbol.upper()
+    api.refresh_trend(symbol)
+    return response_cache.respond(
+        ('trend', symbol, days, resolution),
+        api.trend_store.version,
+        lambda: api.trend_store.query_json(symbol, days, resolution).encode('utf-8')
+    )
 
 @app.route('/api/news')
 def get_news():
-    """Get latest news"""
+    """Get latest news, optionally for one symbol"""
     count = request.args.get('count', 6, type=int)
-    news = api.get_latest_news(count)
-    return jsonify(news)
+    symbol = request.args.get('symbol')
+    symbol = symbol.upper() if symbol else None
+    return response_cache.respond(
+        ('news', count, symbol),
+        live_collector.news_version,
+        lambda: api.get_latest_news(count, symbol)
+    )
 
 @app.route('/api/wordcloud')
 def get_wordcloud():
     """Get word cloud data"""
-    return jsonify(api.word_cloud)
+    symbol = request.args.get('symbol')
+    window = request.args.get('window', '24h')
+    if window not in WINDOWS:
+        return jsonify({'error': f"window must be one of {', '.join(WINDOWS)}"}), 400
+    count = request.args.get('count', 20, type=int)
+    with_counts = request.args.get('counts', 'false').lower() == 'true'
+    # Top terms change only when titles arrive or the window's oldest bucket rolls off
+    version = (api.term_tracker.version, api.term_tracker.window_epoch(window))
+    return response_cache.respond(
+        ('wordcloud', symbol and symbol.upper(), window, count, with_counts),
+        version,
+        lambda: api.get_word_cloud(symbol, window, count, with_counts)
+    )
+
+# Upper bound on symbols per batch request
+MAX_BATCH_SYMBOLS = int(os.getenv('MAX_BATCH_SYMBOLS', 50))
+
+def batch_symbols():
+    """(upper-cased, de-duplicated symbols, None) from a JSON batch request body, or (None, 400 response)"""
+    body = request.get_json(silent=True) or {}
+    symbols = body.get('symbols', [])
+    if not isinstance(symbols, list) or not symbols:
+        return None, (jsonify({'error': 'symbols must be a non-empty list'}), 400)
+    symbols = list(dict.fromkeys(str(symbol).upper() for symbol in symbols))
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        # Rejected outright rather than truncated, so no symbol silently goes missing from the results
+        return None, (jsonify({
+            'error': f'at most {MAX_BATCH_SYMBOLS} distinct symbols per batch',
+            'max_symbols': MAX_BATCH_SYMBOLS,
+            'received': len(symbols)
+        }), 400)
+    return symbols, None
+
+@app.route('/api/sentiment/batch', methods=['POST'])
+def get_sentiment_batch():
+    """Get current sentiment for a list of symbols: {"symbols": ["AAPL", ...]}"""
+    symbols, error = batch_symbols()
+    if error:
+        return error
+    results, timed_out = api.get_sentiment_batch(symbols)
+    return jsonify({
+        'results': results,
+        'timed_out': timed_out,
+        'partial': bool(timed_out)
+    })
+
+@app.route('/api/recommendation/batch', methods=['POST'])
+def get_recommendation_batch():
+    """Get buy/sell recommendations for a list of symbols: {"symbols": ["AAPL", ...]}"""
+    symbols, error = batch_symbols()
+    if error:
+        return error
+    sentiments, timed_out = api.get_sentiment_batch(symbols)
+    results = {
+        symbol: api.get_recommendation(symbol, sentiment=sentiment)
+        for symbol, sentiment in sentiments.items()
+    }
+    return jsonify({
+        'results': results,
+        'timed_out': timed_out,
+        'partial': bool(timed_out)
+    })
 
 @app.route('/api/recommendation/<symbol>')
 def get_recommendation(symbol):
@@ -351,70 +565,123 @@ def get_recommendation(symbol):
     recommendation = api.get_recommendation(symbol)
     return jsonify(recommendation)
 
+@app.route('/api/dashboard/<symbol>')
+def get_dashboard(symbol):
+    """Get every dashboard section for a symbol in one compressed payload"""
+    days = request.args.get('days', 30, type=int)
+    news_count = request.args.get('news', 8, type=int)
+    window = request.args.get('window', '24h')
+    if window not in WINDOWS:
+        window = '24h'
+    return json_response(api.get_dashboard(symbol, days, news_count, window))
+
+@app.route('/api/stream/<symbol>')
+def stream_updates(symbol):
+    """Push sentiment, news and recommendation deltas as server-sent events"""
+    symbol = symbol.upper()
+    prefetch_scheduler.record_request(symbol)
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('lastEventId'))
+    last_event_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    
+    # Only prefetched symbols get pushed updates; the first event tells the client to poll otherwise
+    live = PREFETCH_ENABLED and symbol in prefetch_scheduler.allowed_symbols
+    
+    # Open streams keep their symbol at the front of the prefetch queue
+    stream = event_broker.stream(symbol, last_event_id, on_heartbeat=lambda: prefetch_scheduler.record_request(symbol),
+                                 status={'live': live})
+    return Response(stream, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/companies')
 def get_companies():
     """Get list of supported companies"""
-    companies = []
-    for symbol, info in live_collector.company_map.items():
-        companies.append({
-            'symbol': symbol,
-            'name': info['name'],
-            'keywords': info['keywords']
-        })
-    return jsonify(companies)
+    def build():
+        companies = []
+        for symbol, info in live_collector.company_map.items():
+            companies.append({
+                'symbol': symbol,
+                'name': info['name'],
+                'keywords': info['keywords']
+            })
+        return companies
+    # The company map is fixed for the life of the process
+    return response_cache.respond(('companies',), 0, build)
 
 @app.route('/api/health')
 def health_check():
     """Health check endpoint"""
     return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
 
+@app.route('/api/metrics')
+def get_metrics():
+    """Cache and model metrics"""
+    return jsonify({
+        'model_version': ml_predictor.artifact_version,
+        'inference_mode': ml_predictor.inference_mode,
+        'prediction_cache': ml_predictor.prediction_cache.stats(),
+        'sentiment_cache': sentiment_cache.stats(),
+        'prefetch': prefetch_scheduler.stats(),
+        'stream_subscribers': event_broker.subscriber_count(),
+        'response_cache': response_cache.stats(),
+        'upstream_http': live_collector.transport.stats(),
+        'circuit_breakers': live_collector.breaker_stats(),
+        'online_training': online_trainer.stats() if online_trainer else None
+    })
+
 @app.route('/api/clear-cache', methods=['POST'])
 def clear_cache():
     """Clear sentiment data cache for fresh data"""
-    global live_sentiment_cache
-    live_sentiment_cache['data'] = None
-    live_sentiment_cache['timestamp'] = None
+    sentiment_cache.clear()
     return jsonify({'status': 'cache cleared', 'timestamp': datetime.now().isoformat()})
 
 def initialize_ml_model():
-    """Initialize and train ML model in background"""
+    """Train ML model in background and store it for the next start"""
     try:
         print("Training ML sentiment model...")
-        ml_predictor.train_models()
+        ml_predictor.train_and_store(model_store)
         print("ML model training completed!")
     except Exception as e:
         print(f"ML model training failed: {e}")
         print("Using VADER sentiment as fallback")
 
-def preload_live_data():
-    """Preload live sentiment data"""
-    try:
-        print("Preloading live sentiment data...")
-        live_collector.get_comprehensive_sentiment('AAPL', 'Apple')
-        print("Live data preloaded!")
-    except Exception as e:
-        print(f"Live data preloading failed: {e}")
+def start_background_services():
+    """Load or train the model and start the background workers
+    
+    Runs on import so every WSGI worker process gets a model, not only `python app.py`. With a
+    preloading server (gunicorn --preload) threads do not survive the fork, so import per worker.
+    """
+    # Warm start from a stored model artifact; only retrain in background when inputs changed
+    if online_trainer:
+        online_thread = threading.Thread(target=online_trainer.start)
+        online_thread.daemon = True
+        online_thread.start()
+    elif not ml_predictor.warm_start(model_store):
+        ml_thread = threading.Thread(target=initialize_ml_model)
+        ml_thread.daemon = True
+        ml_thread.start()
+    
+    # Keep every configured symbol warm in the sentiment cache
+    if PREFETCH_ENABLED:
+        prefetch_scheduler.start()
+
+start_background_services()
 
 if __name__ == '__main__':
     print("Starting Market Sentiment API with Live Data Integration...")
     
-    # Initialize ML model in background
-    ml_thread = threading.Thread(target=initialize_ml_model)
-    ml_thread.daemon = True
-    ml_thread.start()
-    
-    # Preload live data
-    data_thread = threading.Thread(target=preload_live_data)
-    data_thread.daemon = True  
-    data_thread.start()
-    
     print("Available endpoints:")
     print("  GET /api/sentiment/<symbol> - Current sentiment scores (LIVE DATA + ML)")
-    print("  GET /api/trend/<symbol>?days=30 - Sentiment trend data")  
-    print("  GET /api/news?count=6 - Latest news (LIVE DATA)")
-    print("  GET /api/wordcloud - Word cloud data")
+    print("  GET /api/trend/<symbol>?days=30&resolution=daily - Sentiment trend data")  
+    print("  GET /api/news?symbol=AAPL&count=6 - Latest news (LIVE DATA)")
+    print("  GET /api/wordcloud?symbol=AAPL&window=24h - Word cloud data (LIVE DATA)")
     print("  GET /api/recommendation/<symbol> - Buy/sell recommendation (ML ENHANCED)")
+    print("  POST /api/sentiment/batch, /api/recommendation/batch - Many symbols in one request")
+    print("  GET /api/dashboard/<symbol>?days=30 - All dashboard sections in one snapshot")
+    print("  GET /api/stream/<symbol> - Server-sent sentiment updates")
     print("  GET /api/health - Health check")
+    print("  GET /api/metrics - Cache and model metrics")
     print("")
     print("🔥 FEATURES:")
     print("  ✅ Live News API integration")  
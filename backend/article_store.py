@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Tracking parameters that make the same article look like a new URL
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|cmpid|ref|src)$', re.IGNORECASE)
+
+
+def normalize_url(url):
+    """Lower-cased host, no fragment, tracking parameters or trailing slash"""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted((key, value) for key, value in parse_qsl(parts.query) if not TRACKING_PARAMS.match(key)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), query, ''))
+
+
+def item_key(record, text):
+    """Stable identity of an article or post: its normalized URL or post id, else a hash of its text"""
+    if record.get('url'):
+        identity = 'url:' + normalize_url(record['url'])
+    elif record.get('id'):
+        identity = 'id:' + str(record['id'])
+    else:
+        identity = 'text:' + ' '.join(text.lower().split())
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+
+def published_at(record):
+    """ISO-8601 UTC publish time of an article or post, or now"""
+    if record.get('publishedAt'):
+        return record['publishedAt']
+    if record.get('created_utc'):
+        return datetime.fromtimestamp(record['created_utc'], tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class ArticleStore:
+    """SQLite store of scored articles and posts, deduplicated per symbol and source"""
+
+    def __init__(self, db_path=None):
+        default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'articles.db')
+        self.db_path = db_path or os.getenv('ARTICLE_STORE_DB', default_path)
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")  # Readers do not block the collector's writes
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    item_key TEXT NOT NULL,
+                    published_at TEXT NOT NULL,
+                    collected_at REAL NOT NULL,
+                    sentiment_score REAL,
+                    record TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS items_key ON items (symbol, source, item_key)")
+            conn.execute("CREATE INDEX IF NOT EXISTS items_published ON items (source, symbol, published_at)")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def known(self, symbol, source, keys):
+        """{key: stored record} for the keys already stored for this symbol and source"""
+        stored = {}
+        keys = list(keys)
+        with self._connect() as conn:
+            for start in range(0, len(keys), 500):  # Stay under SQLite's bound parameter limit
+                chunk = keys[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT item_key, record FROM items WHERE symbol = ? AND source = ? "
+                    f"AND item_key IN ({', '.join('?' * len(chunk))})",
+                    (symbol, source, *chunk)
+                )
+                stored.update((key, json.loads(record)) for key, record in rows)
+        return stored
+
+    def insert(self, symbol, source, keyed_records):
+        """Insert (key, scored record) pairs, ignoring keys already stored; returns the number inserted"""
+        now = time.time()
+        rows = [
+            (symbol, source, key, published_at(record), now, record.get('sentiment_score'), json.dumps(record))
+            for key, record in keyed_records
+        ]
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO items (symbol, source, item_key, published_at, collected_at, sentiment_score, record) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return conn.total_changes - before
+
+    def since(self, symbol, source):
+        """Cursor: publish time of the newest stored item for a symbol and source, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT MAX(published_at) FROM items WHERE source = ? AND symbol = ?", (source, symbol)
+            ).fetchone()
+        return row[0] if row and row[0] else None
+
+    def recent(self, source, limit=6, symbol=None, since=None):
+        """Newest stored records of a source, optionally for one symbol and published at or after `since`"""
+        query = "SELECT record FROM items WHERE source = ?"
+        params = [source]
+        if symbol:
+            query += " AND symbol = ?"
+            params.append(symbol)
+        if since:
+            query += " AND published_at >= ?"
+            params.append(since)
+        query += " ORDER BY published_at DESC LIMIT ?"
+        params.append(limit)
+        with self._connect() as conn:
+            return [json.loads(record) for (record,) in conn.execute(query, params)]
+
+    def history(self, since):
+        """(symbol, source, record) for every item published at or after an ISO-8601 time"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT symbol, source, record FROM items WHERE published_at >= ? ORDER BY published_at", (since,)
+            ).fetchall()
+        return [(symbol, source, json.loads(record)) for symbol, source, record in rows]
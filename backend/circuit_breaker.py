@@ -0,0 +1,59 @@
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Per-upstream breaker: opens after consecutive failures, closes again after a successful probe"""
+
+    def __init__(self, name, failure_threshold=3, reset_seconds=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        self.opens = 0
+        self.short_circuited = 0
+
+    def allow(self):
+        """Whether a request may go upstream; open and half-open breakers short-circuit callers"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            self.short_circuited += 1
+            return False
+
+    def begin_probe(self):
+        """Move an open breaker past its reset timeout to half-open; True for the one caller that should probe"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() >= self._opened_at + self.reset_seconds:
+                self.state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self._failures >= self.failure_threshold):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self.opens += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self._failures,
+                'opens': self.opens,
+                'short_circuited': self.short_circuited
+            }
@@ -0,0 +1,130 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import wait
+from datetime import datetime, timedelta
+
+# FRED publishes these monthly or quarterly; hours between refresh checks
+DEFAULT_REFRESH_HOURS = {
+    'GDP': 24,
+    'UNRATE': 12,
+    'CPIAUCSL': 12,
+    'FEDFUNDS': 12,
+    'UMCSENT': 12
+}
+
+
+class EconomicSeriesStore:
+    """SQLite-backed FRED series store refreshed incrementally and served from memory"""
+
+    def __init__(self, db_path=None, refresh_hours=None, initial_days=90, retry_seconds=300):
+        default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'economic_series.db')
+        self.db_path = db_path or os.getenv('ECONOMIC_SERIES_DB', default_path)
+        self.refresh_hours = dict(DEFAULT_REFRESH_HOURS, **(refresh_hours or {}))
+        self.initial_days = initial_days
+        self.retry_seconds = retry_seconds
+
+        self._lock = threading.Lock()
+        self._indicators = {}  # series_id -> indicator dict
+        self._refreshing = set()
+        self._next_attempt = {}
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS observations (
+                    series_id TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    value REAL NOT NULL,
+                    PRIMARY KEY (series_id, date)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS refresh_log (
+                    series_id TEXT PRIMARY KEY,
+                    refreshed_at REAL NOT NULL
+                )
+            """)
+            refreshed = dict(conn.execute("SELECT series_id, refreshed_at FROM refresh_log"))
+
+        # Resume refresh schedule across restarts
+        for series_id, refreshed_at in refreshed.items():
+            self._next_attempt[series_id] = refreshed_at + self.refresh_hours.get(series_id, 12) * 3600
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def is_due(self, series_id):
+        """Whether a series should be checked upstream for new observations"""
+        return time.time() >= self._next_attempt.get(series_id, 0)
+
+    def last_date(self, series_id):
+        """Date of the newest stored observation, or None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(date) FROM observations WHERE series_id = ?", (series_id,)).fetchone()
+        return row[0] if row and row[0] else None
+
+    def refresh_series(self, series_id, fetch):
+        """Request only observations after the last stored date and append them"""
+        try:
+            last_date = self.last_date(series_id)
+            if last_date:
+                start_date = datetime.strptime(last_date, '%Y-%m-%d') + timedelta(days=1)
+            else:
+                start_date = datetime.now() - timedelta(days=self.initial_days)
+
+            data = fetch(series_id, start_date)
+            rows = [(series_id, date.strftime('%Y-%m-%d'), float(value))
+                    for date, value in data.items() if value == value]  # Skip NaN
+            now = time.time()
+            with self._lock, self._connect() as conn:
+                conn.executemany("INSERT OR REPLACE INTO observations VALUES (?, ?, ?)", rows)
+                conn.execute("INSERT OR REPLACE INTO refresh_log VALUES (?, ?)", (series_id, now))
+            self._next_attempt[series_id] = now + self.refresh_hours.get(series_id, 12) * 3600
+            print(f"Refreshed {series_id}: {len(rows)} new observations")
+        except Exception as e:
+            print(f"Error refreshing {series_id}: {e}")
+            self._next_attempt[series_id] = time.time() + self.retry_seconds
+        finally:
+            self._load_indicator(series_id)
+            with self._lock:
+                self._refreshing.discard(series_id)
+
+    def _load_indicator(self, series_id):
+        """Summarize the two newest stored observations into the in-memory indicator"""
+        with self._connect() as conn:
+            values = [row[0] for row in conn.execute(
+                "SELECT value FROM observations WHERE series_id = ? ORDER BY date DESC LIMIT 2", (series_id,)
+            )]
+        if not values:
+            return
+        current = values[0]
+        previous = values[1] if len(values) > 1 else current
+        with self._lock:
+            self._indicators[series_id] = {
+                'current': current,
+                'previous': previous,
+                'trend': 'up' if current > previous else 'down'
+            }
+
+    def get_indicators(self, series_map, fetch, executor, timeout=None):
+        """Indicator dict for {name: series_id}, refreshing only the series that are due"""
+        futures = []
+        for series_id in series_map.values():
+            # Observations persisted by an earlier process are served before any upstream call
+            if series_id not in self._indicators:
+                self._load_indicator(series_id)
+            with self._lock:
+                if series_id in self._refreshing or not self.is_due(series_id):
+                    continue
+                self._refreshing.add(series_id)
+            futures.append(executor.submit(self.refresh_series, series_id, fetch))
+
+        # Wait for due refreshes up to the deadline; late ones finish in the background
+        if futures:
+            wait(futures, timeout=timeout)
+
+        with self._lock:
+            return {name: dict(self._indicators[series_id])
+                    for name, series_id in series_map.items() if series_id in self._indicators}
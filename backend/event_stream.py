@@ -0,0 +1,107 @@
+import json
+import queue
+import threading
+from collections import deque
+
+
+class Subscription(queue.Queue):
+    """A subscriber's bounded event queue; `closed` once the broker drops it for falling behind"""
+
+    closed = False
+
+
+class EventBroker:
+    """Per-symbol server-sent event fan-out with replay for Last-Event-ID resume"""
+
+    def __init__(self, history_size=100, heartbeat_seconds=15, max_queue=100):
+        self.history_size = history_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._history = {}  # symbol -> deque of (event_id, event, data)
+        self._subscribers = {}  # symbol -> set of queues
+        self._snapshots = {}  # symbol -> latest full sections
+
+    def subscriber_count(self, symbol=None):
+        with self._lock:
+            if symbol is not None:
+                return len(self._subscribers.get(symbol, ()))
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish_snapshot(self, symbol, sections):
+        """Emit only the sections that changed since the last snapshot"""
+        with self._lock:
+            previous = self._snapshots.get(symbol, {})
+            delta = {name: value for name, value in sections.items() if previous.get(name) != value}
+            self._snapshots[symbol] = dict(previous, **sections)
+        if delta:
+            self.publish(symbol, 'update', delta)
+
+    def publish(self, symbol, event, data):
+        """Send an event to every subscriber of a symbol and keep it for replay"""
+        payload = json.dumps(data)
+        with self._lock:
+            event_id = self._next_id
+            self._next_id += 1
+            self._history.setdefault(symbol, deque(maxlen=self.history_size)).append((event_id, event, payload))
+            subscribers = list(self._subscribers.get(symbol, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait((event_id, event, payload))
+            except queue.Full:
+                # Slow client: drop it and end its stream; it reconnects and replays from its Last-Event-ID
+                subscriber.closed = True
+                self.unsubscribe(symbol, subscriber)
+
+    def subscribe(self, symbol, last_event_id=None):
+        """Register a subscriber and return its queue plus the events it missed"""
+        subscriber = Subscription(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(symbol, set()).add(subscriber)
+            history = list(self._history.get(symbol, ()))
+            snapshot = self._snapshots.get(symbol)
+            latest_id = self._next_id - 1
+
+        if last_event_id is not None and history and history[0][0] <= last_event_id + 1:
+            backlog = [entry for entry in history if entry[0] > last_event_id]
+        elif snapshot is not None:
+            # New client, or the gap is older than the replay buffer: start from a full snapshot
+            backlog = [(latest_id, 'snapshot', json.dumps(snapshot))]
+        else:
+            backlog = []
+        return subscriber, backlog
+
+    def unsubscribe(self, symbol, subscriber):
+        with self._lock:
+            self._subscribers.get(symbol, set()).discard(subscriber)
+
+    def stream(self, symbol, last_event_id=None, on_heartbeat=None, status=None):
+        """Generator of SSE frames: replayed backlog, live events and periodic heartbeats
+
+        `status`, if given, goes out first as an unnumbered `status` event so it never moves the
+        client's Last-Event-ID.
+        """
+        subscriber, backlog = self.subscribe(symbol, last_event_id)
+        try:
+            yield "retry: 5000\n\n"
+            if status is not None:
+                yield f"event: status\ndata: {json.dumps(status)}\n\n"
+            for entry in backlog:
+                yield self.format_event(*entry)
+            while not subscriber.closed:
+                try:
+                    entry = subscriber.get(timeout=self.heartbeat_seconds)
+                    if subscriber.closed:
+                        break  # Events after the gap are replayed on reconnect
+                    yield self.format_event(*entry)
+                except queue.Empty:
+                    if on_heartbeat:
+                        on_heartbeat()
+                    yield ": heartbeat\n\n"
+        finally:
+            self.unsubscribe(symbol, subscriber)
+
+    @staticmethod
+    def format_event(event_id, event, payload):
+        return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
@@ -0,0 +1,295 @@
+"""Local stand-in for the NewsAPI, Reddit and FRED endpoints the collector calls
+
+Serves deterministic, seeded corpora with configurable latency, error rates and corpus sizes so the
+full fetch-score-serve path can be load tested offline. Point the collector at it with:
+
+    NEWSAPI_URL=http://localhost:8900 NEWS_API_KEY=fake
+    REDDIT_URL=http://localhost:8900 REDDIT_OAUTH_URL=http://localhost:8900
+    REDDIT_CLIENT_ID=fake REDDIT_CLIENT_SECRET=fake
+    FRED_URL=http://localhost:8900/fred FRED_API_KEY=fake
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+HEADLINES = {
+    'positive': [
+        '{name} rallies on strong earnings beat',
+        'Analysts upgrade {name} after record quarter',
+        '{name} announces innovative product launch',
+        '{name} shares hit new high on robust demand',
+        '{name} raises guidance as growth accelerates'
+    ],
+    'negative': [
+        '{name} faces regulatory scrutiny over practices',
+        '{name} stock declines on weak guidance',
+        'Supply chain problems hurt {name} margins',
+        '{name} CEO departure raises concerns',
+        'Investors worried as {name} misses estimates'
+    ],
+    'neutral': [
+        '{name} quarterly earnings meet expectations',
+        '{name} maintains market position',
+        '{name} awaits regulatory decision',
+        '{name} stock trades in a narrow range',
+        'Investors monitor {name} ahead of conference'
+    ]
+}
+
+DESCRIPTIONS = {
+    'positive': 'Strong fundamentals and improving outlook support further growth.',
+    'negative': 'Challenging conditions create uncertainty for investors and the business.',
+    'neutral': 'Market participants are watching for clearer directional signals.'
+}
+
+PUBLISHERS = ['Financial Times', 'Bloomberg', 'Reuters', 'WSJ', 'CNBC', 'MarketWatch']
+
+# Starting level and monthly volatility of each fake FRED series
+SERIES = {
+    'GDP': (27000.0, 150.0),
+    'UNRATE': (3.8, 0.1),
+    'CPIAUCSL': (305.0, 0.8),
+    'FEDFUNDS': (5.25, 0.1),
+    'UMCSENT': (70.0, 2.5)
+}
+
+
+def iso_utc(value):
+    """NewsAPI-style `from` value (date or ISO-8601 time, naive taken as UTC) as a comparable UTC string"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class FakeUpstream:
+    """Deterministic corpora plus the latency and failure behaviour of the fake server"""
+
+    def __init__(self, seed=42, latency_ms=80.0, latency_sigma=0.5, error_rate=0.0, throttle_rate=0.0,
+                 corpus_size=200, window_days=7):
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.corpus_size = corpus_size
+        self.window_days = window_days
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def draw_outcome(self):
+        """(latency in seconds, status) for the next request: log-normal latency around the median"""
+        with self._lock:
+            self.requests += 1
+            latency = 0.0
+            if self.latency_ms > 0:
+                latency = self._rng.lognormvariate(math.log(self.latency_ms / 1000), self.latency_sigma)
+            roll = self._rng.random()
+        if roll < self.error_rate:
+            return latency, 503
+        if roll < self.error_rate + self.throttle_rate:
+            return latency, 429
+        return latency, 200
+
+    def anchor(self):
+        """Current hour: timestamps stay identical for repeated requests within the hour"""
+        return datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+    def articles(self, query, page_size=20, since=None):
+        """Newest `page_size` of a query's corpus, optionally only those published since a time"""
+        terms = [term.strip() for term in re.split(r'\bOR\b', query or 'market') if term.strip()]
+        name = terms[1] if len(terms) > 1 else terms[0]
+        rng = random.Random(f"{self.seed}:news:{query}")
+        anchor = self.anchor()
+        span = self.window_days * 86400
+
+        articles = []
+        for i in range(self.corpus_size):
+            tone = rng.choice(list(HEADLINES))
+            published = anchor - timedelta(seconds=span * i / self.corpus_size)
+            title = rng.choice(HEADLINES[tone]).format(name=name)
+            slug = re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
+            articles.append({
+                'source': {'id': None, 'name': rng.choice(PUBLISHERS)},
+                'author': 'Fake Upstream',
+                'title': title,
+                'description': DESCRIPTIONS[tone],
+                'url': f"https://news.fake-upstream.local/{slug}-{i}",
+                'urlToImage': None,
+                'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'content': f"{title}. {DESCRIPTIONS[tone]}"
+            })
+
+        if since:
+            articles = [article for article in articles if article['publishedAt'] >= since]
+        return articles[:page_size], len(articles)
+
+    def posts(self, subreddit, query, limit=25):
+        """Search results of one subreddit for a term as Reddit listing children"""
+        rng = random.Random(f"{self.seed}:reddit:{subreddit}:{query}")
+        anchor = self.anchor().timestamp()
+        children = []
+        for i in range(min(limit, self.corpus_size)):
+            tone = rng.choice(list(HEADLINES))
+            post_id = hashlib.sha1(f"{self.seed}:{subreddit}:{query}:{i}".encode('utf-8')).hexdigest()[:7]
+            title = rng.choice(HEADLINES[tone]).format(name=query)
+            children.append({'kind': 't3', 'data': {
+                'id': post_id,
+                'name': f"t3_{post_id}",
+                'title': title,
+                'selftext': f"{DESCRIPTIONS[tone]} Thoughts on {query}?",
+                'score': rng.randint(0, 500),
+                'num_comments': rng.randint(0, 100),
+                'created_utc': anchor - i * 3600,
+                'subreddit': subreddit,
+                'author': f"fake_user_{rng.randint(1, 999)}",
+                'permalink': f"/r/{subreddit}/comments/{post_id}/",
+                'url': f"https://www.reddit.com/r/{subreddit}/comments/{post_id}/",
+                'is_self': True
+            }})
+        return children
+
+    def observations(self, series_id, start=None):
+        """Monthly random-walk observations for a series over the last five years"""
+        level, volatility = SERIES.get(series_id, (100.0, 1.0))
+        rng = random.Random(f"{self.seed}:fred:{series_id}")
+        month = datetime.now(timezone.utc).replace(day=1).date()
+        dates = []
+        for _ in range(60):
+            dates.append(month)
+            month = (month - timedelta(days=1)).replace(day=1)
+
+        observations = []
+        for date in reversed(dates):
+            level += rng.gauss(0, volatility)
+            observations.append({
+                'realtime_start': date.isoformat(),
+                'realtime_end': date.isoformat(),
+                'date': date.isoformat(),
+                'value': f"{level:.3f}"
+            })
+        if start:
+            observations = [observation for observation in observations if observation['date'] >= start]
+        return observations
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    """Routes NewsAPI, Reddit OAuth/search and FRED requests to the server's FakeUpstream"""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so client connection pooling is exercised
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self.handle_request()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        if length:
+            self.rfile.read(length)
+        self.handle_request()
+
+    def handle_request(self):
+        upstream = self.server.upstream
+        parts = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        path = parts.path.rstrip('/')
+
+        latency, status = upstream.draw_outcome()
+        time.sleep(latency)
+        if status == 429:
+            return self.send_json({'status': 'error', 'code': 'rateLimited', 'message': 'Too many requests'},
+                                  429, {'Retry-After': '1'})
+        if status != 200:
+            return self.send_json({'status': 'error', 'code': 'unavailable', 'message': 'Injected failure'}, status)
+
+        if path == '/v2/everything':
+            articles, total = upstream.articles(params.get('q'), int(params.get('pageSize', 20)), iso_utc(params.get('from')))
+            return self.send_json({'status': 'ok', 'totalResults': total, 'articles': articles})
+
+        if path == '/api/v1/access_token':
+            return self.send_json({'access_token': 'fake-token', 'token_type': 'bearer', 'expires_in': 3600, 'scope': '*'})
+
+        match = re.fullmatch(r'/r/([^/]+)/search', path)
+        if match:
+            children = upstream.posts(match.group(1), params.get('q', ''), int(params.get('limit', 25)))
+            listing = {'kind': 'Listing', 'data': {'after': None, 'before': None, 'dist': len(children), 'children': children}}
+            return self.send_json(listing, headers={
+                'x-ratelimit-remaining': '99', 'x-ratelimit-used': '1', 'x-ratelimit-reset': '60'
+            })
+
+        if path == '/fred/series/observations':
+            observations = upstream.observations(params.get('series_id', ''), params.get('observation_start'))
+            return self.send_json({'units': 'lin', 'count': len(observations), 'observations': observations})
+
+        if path == '/health':
+            return self.send_json({'status': 'ok', 'requests': upstream.requests})
+
+        return self.send_json({'status': 'error', 'message': f"unknown path {parts.path}"}, 404)
+
+    def send_json(self, payload, status=200, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server(upstream, host='127.0.0.1', port=8900, verbose=False):
+    """Serve a FakeUpstream on a background thread; returns the server (call shutdown() to stop)"""
+    server = ThreadingHTTPServer((host, port), FakeUpstreamHandler)
+    server.daemon_threads = True
+    server.upstream = upstream
+    server.verbose = verbose
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default=os.getenv('FAKE_UPSTREAM_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('FAKE_UPSTREAM_PORT', 8900)))
+    parser.add_argument('--seed', type=int, default=int(os.getenv('FAKE_UPSTREAM_SEED', 42)))
+    parser.add_argument('--latency-ms', type=float, default=float(os.getenv('FAKE_UPSTREAM_LATENCY_MS', 80)),
+                        help='median response latency')
+    parser.add_argument('--latency-sigma', type=float, default=float(os.getenv('FAKE_UPSTREAM_LATENCY_SIGMA', 0.5)),
+                        help='log-normal shape; larger values give a longer tail')
+    parser.add_argument('--error-rate', type=float, default=float(os.getenv('FAKE_UPSTREAM_ERROR_RATE', 0)),
+                        help='fraction of requests answered with 503')
+    parser.add_argument('--throttle-rate', type=float, default=float(os.getenv('FAKE_UPSTREAM_THROTTLE_RATE', 0)),
+                        help='fraction of requests answered with 429')
+    parser.add_argument('--corpus-size', type=int, default=int(os.getenv('FAKE_UPSTREAM_CORPUS_SIZE', 200)),
+                        help='articles per news query and maximum posts per search')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    upstream = FakeUpstream(args.seed, args.latency_ms, args.latency_sigma, args.error_rate, args.throttle_rate,
+                            args.corpus_size)
+    server = start_server(upstream, args.host, args.port, args.verbose)
+    print(f"Fake upstream listening on http://{args.host}:{args.port} (seed {args.seed})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
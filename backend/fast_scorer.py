@@ -0,0 +1,152 @@
+import re
+import time
+
+import numpy as np
+from sklearn.linear_model import Ridge
+
+
+class CompiledLinearScorer:
+    """Scores cleaned text with plain dict lookups and dot products instead of sklearn calls"""
+
+    def __init__(self, vocabulary, idf, stop_words, token_pattern, classes,
+                 lr_coef, lr_intercept, lr_multinomial, student_coef, student_intercept):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.stop_words = stop_words
+        self.token_pattern = token_pattern
+        self.classes = classes
+        self.lr_coef = lr_coef
+        self.lr_intercept = lr_intercept
+        self.lr_multinomial = lr_multinomial
+        self.student_coef = student_coef
+        self.student_intercept = student_intercept
+        self._token_re = re.compile(token_pattern)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_token_re']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._token_re = re.compile(self.token_pattern)
+
+    @classmethod
+    def compile(cls, vectorizer, logistic_model, teacher_model, X_train_vec, alpha=1.0):
+        """Export a fitted TF-IDF + logistic model and distill the teacher into a linear student"""
+        if (vectorizer.analyzer != 'word' or vectorizer.ngram_range != (1, 1) or
+                not vectorizer.use_idf or vectorizer.sublinear_tf or vectorizer.norm != 'l2' or
+                vectorizer.strip_accents is not None):
+            raise ValueError("Only unigram, l2-normalized TF-IDF vectorizers can be compiled")
+
+        classes = np.asarray(logistic_model.classes_)
+        if not np.array_equal(classes, np.asarray(teacher_model.classes_)):
+            raise ValueError("Logistic and teacher models disagree on class order")
+
+        # Linear student trained to reproduce the teacher's class probabilities
+        teacher_proba = teacher_model.predict_proba(X_train_vec)
+        student = Ridge(alpha=alpha).fit(X_train_vec, teacher_proba)
+
+        return cls(
+            vocabulary={term: int(index) for term, index in vectorizer.vocabulary_.items()},
+            idf=np.asarray(vectorizer.idf_, dtype=np.float64),
+            stop_words=frozenset(vectorizer.get_stop_words() or ()),
+            token_pattern=vectorizer.token_pattern,
+            classes=[str(c) for c in classes],
+            lr_coef=np.ascontiguousarray(logistic_model.coef_, dtype=np.float64),
+            lr_intercept=np.asarray(logistic_model.intercept_, dtype=np.float64),
+            lr_multinomial=getattr(logistic_model, 'multi_class', 'auto') != 'ovr',
+            student_coef=np.ascontiguousarray(student.coef_, dtype=np.float64),
+            student_intercept=np.asarray(student.intercept_, dtype=np.float64)
+        )
+
+    def vectorize(self, cleaned_text):
+        """Return the non-zero feature indices and l2-normalized TF-IDF values"""
+        counts = {}
+        for token in self._token_re.findall(cleaned_text):
+            if token in self.stop_words:
+                continue
+            index = self.vocabulary.get(token)
+            if index is not None:
+                counts[index] = counts.get(index, 0) + 1
+
+        indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts)) * self.idf[indices]
+        norm = np.sqrt(values @ values)
+        if norm > 0:
+            values /= norm
+        return indices, values
+
+    def logistic_proba(self, indices, values):
+        """Logistic regression probabilities from a sparse TF-IDF row"""
+        logits = self.lr_coef[:, indices] @ values + self.lr_intercept
+        if len(self.classes) == 2:
+            positive = 1.0 / (1.0 + np.exp(-logits[0]))
+            return np.array([1.0 - positive, positive])
+        if self.lr_multinomial:
+            exp = np.exp(logits - logits.max())
+            return exp / exp.sum()
+        proba = 1.0 / (1.0 + np.exp(-logits))
+        return proba / proba.sum()
+
+    def student_proba(self, indices, values):
+        """Distilled student's approximation of the teacher probabilities"""
+        proba = np.clip(self.student_coef[:, indices] @ values + self.student_intercept, 0, None)
+        total = proba.sum()
+        return proba / total if total > 0 else np.full(len(self.classes), 1.0 / len(self.classes))
+
+    def predict_proba_one(self, cleaned_text):
+        """Ensemble probabilities for a single cleaned text"""
+        indices, values = self.vectorize(cleaned_text)
+        return (self.logistic_proba(indices, values) + self.student_proba(indices, values)) / 2
+
+    def predict_proba(self, cleaned_texts):
+        """Ensemble probabilities for many cleaned texts"""
+        return np.array([self.predict_proba_one(text) for text in cleaned_texts]).reshape(-1, len(self.classes))
+
+
+def compare_with_sklearn(predictor, texts):
+    """Check parity and latency of the compiled scorer against the sklearn path"""
+    scorer = predictor.fast_scorer
+    cleaned_texts = [predictor.clean_text(text) for text in texts]
+    text_vecs = predictor.vectorizer.transform(cleaned_texts)
+
+    sklearn_lr = predictor.models['logistic_regression'].predict_proba(text_vecs)
+    sklearn_ensemble = np.mean([model.predict_proba(text_vecs) for model in predictor.models.values()], axis=0)
+
+    fast_lr = np.array([scorer.logistic_proba(*scorer.vectorize(text)) for text in cleaned_texts])
+    fast_ensemble = scorer.predict_proba(cleaned_texts)
+
+    # Per-headline latency, one text at a time as on the request hot path
+    start = time.perf_counter()
+    for text in texts:
+        vec = predictor.vectorizer.transform([predictor.clean_text(text)])
+        np.mean([model.predict_proba(vec)[0] for model in predictor.models.values()], axis=0)
+    sklearn_us = (time.perf_counter() - start) / len(texts) * 1e6
+
+    start = time.perf_counter()
+    for text in texts:
+        scorer.predict_proba_one(predictor.clean_text(text))
+    fast_us = (time.perf_counter() - start) / len(texts) * 1e6
+
+    return {
+        'samples': len(texts),
+        'logistic_max_abs_diff': float(np.max(np.abs(sklearn_lr - fast_lr))),
+        'ensemble_label_agreement': float(np.mean(np.argmax(sklearn_ensemble, axis=1) == np.argmax(fast_ensemble, axis=1))),
+        'sklearn_us_per_text': round(sklearn_us, 1),
+        'fast_us_per_text': round(fast_us, 1)
+    }
+
+
+# Parity and latency report against the sklearn path; the thresholds are enforced in tests/test_fast_scorer.py
+if __name__ == "__main__":
+    import pandas as pd
+    from ml_sentiment_predictor import MarketSentimentPredictor
+
+    predictor = MarketSentimentPredictor()
+    predictor.train_models()
+
+    texts = pd.read_csv(predictor.training_data_path())["title/text"].astype(str).tolist()
+    report = compare_with_sklearn(predictor, texts)
+    for key, value in report.items():
+        print(f"{key}: {value}")
@@ -0,0 +1,252 @@
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import uuid
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # No advisory locks (Windows): imports from concurrent processes are not serialized
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    print("Warning: pyarrow not installed. Historical data will be read from CSV.")
+
+# Compact in-memory types: dictionary-encoded labels and float32 metrics
+COLUMN_DTYPES = {
+    'source': 'category',
+    'type': 'category',
+    'sentiment': 'float32',
+    'unemployment_rate': 'float32',
+    'cpi': 'float32',
+    'sp500': 'float32'
+}
+
+PARTITION_COLUMN = 'month'
+
+# Written next to the partitions; the leading underscore keeps pyarrow from reading it as data
+MANIFEST_NAME = '_manifest.json'
+
+
+def file_digest(path):
+    """sha256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HistoricalStore:
+    """Month-partitioned Parquet store of historical sentiment rows, read with memory mapping"""
+
+    def __init__(self, root_dir=None, csv_path=None):
+        backend_dir = os.path.dirname(os.path.abspath(__file__))
+        self.root_dir = root_dir or os.getenv('HISTORY_STORE_DIR', os.path.join(backend_dir, 'data', 'history'))
+        self.csv_path = csv_path or os.path.join(backend_dir, '..', 'market_sentiment_500.csv')
+
+    def manifest_path(self, root_dir=None):
+        return os.path.join(root_dir or self.root_dir, MANIFEST_NAME)
+
+    def read_manifest(self):
+        """Source CSV fingerprint and content version of the store, or None if never imported"""
+        try:
+            with open(self.manifest_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write_manifest(self, manifest, root_dir=None):
+        path = self.manifest_path(root_dir)
+        # Unique temp name per writer; the underscore prefix keeps pyarrow from reading it as data
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='_manifest-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @contextlib.contextmanager
+    def lock(self):
+        """Exclusive lock across processes (workers importing at startup) for changes to the store"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.root_dir)), exist_ok=True)
+        with open(f"{self.root_dir}.lock", 'a') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def is_imported(self):
+        return pa is not None and self.read_manifest() is not None
+
+    def is_current(self):
+        """Imported, and from the CSV as it is now on disk"""
+        manifest = self.read_manifest() if pa is not None else None
+        if manifest is None:
+            return False
+        if not os.path.exists(self.csv_path):
+            return True  # Nothing to re-import from
+        stat = os.stat(self.csv_path)
+        if (stat.st_size, stat.st_mtime) == (manifest['csv_size'], manifest['csv_mtime']):
+            return True
+        if file_digest(self.csv_path) != manifest['csv_digest']:
+            return False
+        # Touched but unchanged: remember the new mtime so the next check skips hashing
+        self.write_manifest(dict(manifest, csv_size=stat.st_size, csv_mtime=stat.st_mtime))
+        return True
+
+    def version(self):
+        """Digest of the data load() returns: changes whenever the CSV is re-imported or rows are appended"""
+        self.ensure_imported()
+        manifest = self.read_manifest() if pa is not None else None
+        return manifest['version'] if manifest else file_digest(self.csv_path)
+
+    def read_csv(self, csv_path=None):
+        """Parse the legacy CSV with compact dtypes"""
+        return pd.read_csv(csv_path or self.csv_path, dtype=COLUMN_DTYPES, parse_dates=['timestamp'])
+
+    def import_csv(self, csv_path=None):
+        """Import the legacy CSV into the partitioned store, replacing it (and any appended rows)"""
+        with self.lock():
+            return self._import(csv_path or self.csv_path)
+
+    def _import(self, csv_path):
+        # Caller holds the lock
+        stat = os.stat(csv_path)
+        digest = file_digest(csv_path)
+        df = self.read_csv(csv_path)
+        parent, name = os.path.split(os.path.abspath(self.root_dir))
+        tmp_dir = tempfile.mkdtemp(dir=parent, prefix=f"{name}.importing-")
+        retired_dir = f"{tmp_dir}.retired"
+        try:
+            self._write(df, tmp_dir)
+            self.write_manifest({
+                'csv_digest': digest, 'csv_size': stat.st_size, 'csv_mtime': stat.st_mtime, 'version': digest[:16]
+            }, tmp_dir)
+            # Rename the old store aside before swapping in the new one; readers with files open keep them
+            if os.path.isdir(self.root_dir):
+                os.replace(self.root_dir, retired_dir)
+            try:
+                os.replace(tmp_dir, self.root_dir)
+            except OSError:
+                if os.path.isdir(retired_dir):
+                    os.replace(retired_dir, self.root_dir)
+                raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        shutil.rmtree(retired_dir, ignore_errors=True)
+        print(f"Imported {len(df)} historical rows into {self.root_dir}")
+        return len(df)
+
+    def append(self, df):
+        """Add new rows as extra files in their month partitions and advance the store version"""
+        with self.lock():
+            self._write(df, self.root_dir)
+            manifest = self.read_manifest()
+            digest = hashlib.sha256(manifest['version'].encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+            self.write_manifest(dict(manifest, version=digest.hexdigest()[:16]))
+
+    def _write(self, df, root_dir):
+        df = df.assign(**{PARTITION_COLUMN: df['timestamp'].dt.strftime('%Y-%m')})
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_to_dataset(
+            table, root_dir,
+            partition_cols=[PARTITION_COLUMN],
+            basename_template=f"part-{uuid.uuid4().hex[:8]}-{{i}}.parquet"
+        )
+
+    def ensure_imported(self):
+        """Import the CSV on first use and again whenever its contents change"""
+        if pa is None:
+            return
+        try:
+            if self.is_current():
+                return
+            with self.lock():
+                # Another process may have finished the import while this one waited
+                if not self.is_current():
+                    self._import(self.csv_path)
+        except Exception as e:
+            print(f"Error importing historical CSV: {e}")
+
+    def load(self, columns=None, start=None, end=None, sources=None):
+        """Load rows with predicate pushdown on timestamp and source"""
+        self.ensure_imported()
+        if not self.is_imported():
+            return self._load_csv(columns, start, end, sources)
+
+        # Memory-mapped reads; month partitions outside the range are never opened
+        dataset = ds.dataset(self.root_dir, format='parquet', partitioning='hive',
+                             filesystem=pafs.LocalFileSystem(use_mmap=True))
+        expression = None
+        if start is not None:
+            start = pd.Timestamp(start)
+            expression = self._and(expression, ds.field(PARTITION_COLUMN) >= start.strftime('%Y-%m'))
+            expression = self._and(expression, ds.field('timestamp') >= pa.scalar(start.to_pydatetime()))
+        if end is not None:
+            end = pd.Timestamp(end)
+            expression = self._and(expression, ds.field(PARTITION_COLUMN) <= end.strftime('%Y-%m'))
+            expression = self._and(expression, ds.field('timestamp') <= pa.scalar(end.to_pydatetime()))
+        if sources:
+            expression = self._and(expression, ds.field('source').isin(list(sources)))
+
+        if columns is None:
+            columns = [name for name in dataset.schema.names if name != PARTITION_COLUMN]
+        df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+        if 'timestamp' in df.columns:
+            df = df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+        return df
+
+    def months(self):
+        """Month partitions in the store, oldest first"""
+        self.ensure_imported()
+        if not self.is_imported():
+            return []
+        prefix = f"{PARTITION_COLUMN}="
+        return sorted(name[len(prefix):] for name in os.listdir(self.root_dir) if name.startswith(prefix))
+
+    def iter_months(self, columns=None):
+        """Yield the store one month at a time so callers never hold the whole history"""
+        months = self.months()
+        if not months:
+            yield self.load(columns)  # CSV fallback has no partitions to read separately
+            return
+        for month in months:
+            start = pd.Timestamp(f"{month}-01")
+            end = start + pd.offsets.MonthBegin(1) - pd.Timedelta(microseconds=1)
+            yield self.load(columns, start=start, end=end)
+
+    def _load_csv(self, columns, start, end, sources):
+        df = self.read_csv()
+        if start is not None:
+            df = df[df['timestamp'] >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df['timestamp'] <= pd.Timestamp(end)]
+        if sources:
+            df = df[df['source'].isin(list(sources))]
+        return df[columns] if columns else df
+
+    @staticmethod
+    def _and(expression, clause):
+        return clause if expression is None else expression & clause
+
+
+# One-shot importer from the existing CSV
+if __name__ == "__main__":
+    HistoricalStore().import_csv()
@@ -0,0 +1,166 @@
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+
+
+def parse_accept_encoding(header):
+    """{coding: q} from an Accept-Encoding header; malformed q values count as 0"""
+    qualities = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def accepted_encoding(body_size, min_size=MIN_COMPRESS_SIZE):
+    """Best content encoding the client accepts for a body of this size, or None"""
+    if body_size < min_size:
+        return None
+    qualities = parse_accept_encoding(request.headers.get('Accept-Encoding', ''))
+    # An explicit entry wins over "*"; q=0 means "not acceptable"
+    candidates = [coding for coding in ('br', 'gzip') if coding != 'br' or brotli is not None]
+    ranked = [(qualities.get(coding, qualities.get('*', 0.0)), coding) for coding in candidates]
+    quality, coding = max(ranked, key=lambda item: item[0])  # Ties keep the order above: brotli first
+    return coding if quality > 0 else None
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+def json_response(payload, min_size=MIN_COMPRESS_SIZE):
+    """Serialize a one-off payload, compressing it when the client accepts it and it is worth it"""
+    body = json.dumps(payload).encode('utf-8')
+    encoding = accepted_encoding(len(body), min_size)
+    response = Response(compress(body, encoding), mimetype='application/json')
+    response.headers['Vary'] = 'Accept-Encoding'
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+class ResponseCache:
+    """Serialized and compressed JSON bodies keyed by request, rebuilt only when the data version changes"""
+
+    def __init__(self, max_entries=512, min_size=MIN_COMPRESS_SIZE):
+        self.max_entries = max_entries
+        self.min_size = min_size
+        self._entries = OrderedDict()  # key -> (version, content digest, {encoding: body})
+        self._lock = threading.Lock()
+        self.not_modified = 0
+        self.hits = 0
+        self.builds = 0
+
+    def respond(self, key, version, build):
+        """Serve `build()` for (key, version); a matching If-None-Match costs only a header comparison"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+            else:
+                entry = None
+
+        cached = entry is not None
+        if not cached:
+            entry = self._build(key, version, build)
+
+        _, digest, bodies = entry
+        encoding = accepted_encoding(len(bodies[None]), self.min_size)
+        etag = self.etag(digest, encoding)
+        if self._etag_matches(etag):
+            with self._lock:
+                self.not_modified += 1
+            return self._not_modified(etag)
+
+        body = bodies.get(encoding)
+        if body is None:
+            body = compress(bodies[None], encoding)
+            with self._lock:
+                bodies[encoding] = body
+        if cached:
+            with self._lock:
+                self.hits += 1
+
+        response = Response(body, mimetype='application/json')
+        response.headers['ETag'] = etag
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = 'no-cache'  # Always revalidate; revalidation is cheap
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def etag(digest, encoding):
+        """Strong validator per representation: each content coding of the same data gets its own tag"""
+        return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+    def _build(self, key, version, build):
+        payload = build()
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        # Content hash, so a rebuild that yields the same bytes keeps clients' copies valid
+        digest = hashlib.sha1(body).hexdigest()[:20]
+        entry = (version, digest, {None: body})
+        with self._lock:
+            self.builds += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _etag_matches(etag):
+        if_none_match = request.headers.get('If-None-Match', '')
+        if not if_none_match:
+            return False
+        candidates = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return etag in candidates or '*' in candidates
+
+    @staticmethod
+    def _not_modified(etag):
+        response = Response(status=304)
+        response.headers['ETag'] = etag
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'builds': self.builds,
+                'hits': self.hits,
+                'not_modified': self.not_modified,
+                'brotli_available': brotli is not None
+            }
@@ -0,0 +1,303 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+# Responses worth retrying: rate limited or a transient upstream failure
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Client libraries without a base URL option; <API>_URL redirects their requests, e.g. to fake_upstream.py
+FIXED_ORIGINS = {
+    'newsapi': 'https://newsapi.org'
+}
+
+# Provider quotas as (requests per minute, burst); override with <API>_RATE_PER_MINUTE / <API>_BURST
+DEFAULT_LIMITS = {
+    'newsapi': (60, 5),   # Smoothing only; the binding NewsAPI limit is its daily quota below
+    'reddit': (100, 10),  # Reddit OAuth clients get 100 queries per minute
+    'fred': (120, 10)     # FRED allows 120 requests per minute per key
+}
+
+# Providers that also cap requests per rolling day; override with <API>_REQUESTS_PER_DAY
+DAILY_QUOTAS = {
+    'newsapi': 100  # NewsAPI developer plan: 100 requests per 24 hours
+}
+
+
+class RateLimitExceeded(requests.RequestException):
+    """A request waited longer than allowed for its provider's rate limit"""
+
+
+class TokenBucket:
+    """Blocking token-bucket limiter: `rate` tokens per second up to `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait=None):
+        """Take one token, sleeping until one is available; returns seconds waited"""
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - start
+                shortfall = (1 - self._tokens) / self.rate
+            if max_wait is not None and now - start + shortfall > max_wait:
+                raise RateLimitExceeded(f"rate limit wait would exceed {max_wait}s")
+            time.sleep(shortfall)
+
+
+class RollingQuota:
+    """At most `limit` requests in any rolling `window` seconds, e.g. a per-day API quota"""
+
+    def __init__(self, limit, window=86400):
+        self.limit = limit
+        self.window = window
+        self._sent = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait=None):
+        """Record one request, sleeping until the window has room; returns seconds waited"""
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= self.window:
+                    self._sent.popleft()
+                if len(self._sent) < self.limit:
+                    self._sent.append(now)
+                    return now - start
+                shortfall = self._sent[0] + self.window - now
+            if max_wait is not None and now - start + shortfall > max_wait:
+                raise RateLimitExceeded(f"quota of {self.limit} requests per {self.window:g}s used up")
+            time.sleep(shortfall)
+
+    @property
+    def remaining(self):
+        with self._lock:
+            now = time.monotonic()
+            return self.limit - sum(1 for sent in self._sent if now - sent < self.window)
+
+
+class RetryBudget:
+    """Retries allowed across every upstream: each request earns `ratio` of a retry, up to `capacity`"""
+
+    def __init__(self, ratio=0.2, capacity=20):
+        self.ratio = ratio
+        self.capacity = capacity
+        self._balance = capacity
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._balance = min(self.capacity, self._balance + self.ratio)
+
+    def withdraw(self):
+        """Spend one retry; False when the budget is exhausted"""
+        with self._lock:
+            if self._balance >= 1:
+                self._balance -= 1
+                return True
+            return False
+
+    @property
+    def balance(self):
+        with self._lock:
+            return self._balance
+
+
+class TransportMetrics:
+    """Per-API request, retry and rate-limit queueing counters"""
+
+    def __init__(self, name, samples=1000):
+        self.name = name
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=samples)
+        self.requests = 0
+        self.retries = 0
+        self.budget_exhausted = 0
+        self.rate_limited = 0  # Provider answered 429
+        self.errors = 0
+        self.statuses = {}
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self._waits.append(seconds)
+
+    def record_response(self, status):
+        with self._lock:
+            self.requests += 1
+            key = f"{status // 100}xx"
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            if status == 429:
+                self.rate_limited += 1
+
+    def record_error(self):
+        with self._lock:
+            self.requests += 1
+            self.errors += 1
+
+    def record_retry(self, allowed):
+        with self._lock:
+            if allowed:
+                self.retries += 1
+            else:
+                self.budget_exhausted += 1
+
+    def stats(self):
+        with self._lock:
+            waits = np.array(self._waits) if self._waits else np.zeros(1)
+            return {
+                'requests': self.requests,
+                'statuses': dict(self.statuses),
+                'errors': self.errors,
+                'rate_limited': self.rate_limited,
+                'retries': self.retries,
+                'retry_budget_exhausted': self.budget_exhausted,
+                'queue_wait_ms': {
+                    'p50': round(float(np.percentile(waits, 50)) * 1000, 1),
+                    'p95': round(float(np.percentile(waits, 95)) * 1000, 1),
+                    'max': round(float(waits.max()) * 1000, 1)
+                }
+            }
+
+
+class LimitedSession(requests.Session):
+    """Keep-alive session that rate-limits, retries with jitter under a shared budget and records metrics"""
+
+    def __init__(self, limiter, retry_budget, metrics, pool_size=10, max_retries=2, backoff_seconds=0.5,
+                 max_queue_seconds=10, timeout=10, origin_override=None, quota=None):
+        super().__init__()
+        self.origin_override = origin_override  # (origin, replacement) applied to every request URL
+        self.limiter = limiter
+        self.quota = quota  # Optional RollingQuota every attempt, retries included, counts against
+        self.retry_budget = retry_budget
+        self.metrics = metrics
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_queue_seconds = max_queue_seconds
+        self.timeout = timeout
+
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        if not args:
+            kwargs.setdefault('timeout', self.timeout)
+        if self.origin_override and url.startswith(self.origin_override[0]):
+            url = self.origin_override[1].rstrip('/') + url[len(self.origin_override[0]):]
+        attempt = 0
+        while True:
+            if self.quota:
+                self.quota.acquire(self.max_queue_seconds)
+            self.metrics.record_wait(self.limiter.acquire(self.max_queue_seconds))
+            error = None
+            response = None
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                self.metrics.record_error()
+            else:
+                self.metrics.record_response(response.status_code)
+                if response.status_code not in RETRY_STATUSES:
+                    self.retry_budget.deposit()
+                    return response
+
+            allowed = attempt < self.max_retries and self.retry_budget.withdraw()
+            self.metrics.record_retry(allowed)
+            if not allowed:
+                if response is not None:
+                    return response
+                raise error
+
+            # Honour a bounded Retry-After when given, otherwise exponential backoff with full jitter
+            delay = random.uniform(0, self.backoff_seconds * 2 ** attempt)
+            if response is not None:
+                if response.headers.get('Retry-After', '').isdigit():
+                    delay = min(float(response.headers['Retry-After']), self.max_queue_seconds)
+                response.close()  # Hand the connection back to the pool
+            time.sleep(delay)
+            attempt += 1
+
+
+class HttpTransport:
+    """One pooled, rate-limited session per upstream API, all sharing a retry budget"""
+
+    def __init__(self):
+        self.retry_budget = RetryBudget(
+            ratio=float(os.getenv('HTTP_RETRY_BUDGET_RATIO', 0.2)),
+            capacity=int(os.getenv('HTTP_RETRY_BUDGET', 20))
+        )
+        self.sessions = {}
+        for name, (per_minute, burst) in DEFAULT_LIMITS.items():
+            prefix = name.upper()
+            per_minute = float(os.getenv(f'{prefix}_RATE_PER_MINUTE', per_minute))
+            override_url = os.getenv(f'{prefix}_URL') if name in FIXED_ORIGINS else None
+            per_day = int(os.getenv(f'{prefix}_REQUESTS_PER_DAY', DAILY_QUOTAS.get(name, 0)))
+            self.sessions[name] = LimitedSession(
+                TokenBucket(per_minute / 60, float(os.getenv(f'{prefix}_BURST', burst))),
+                self.retry_budget,
+                TransportMetrics(name),
+                pool_size=int(os.getenv(f'{prefix}_POOL_SIZE', 10)),
+                max_retries=int(os.getenv('HTTP_MAX_RETRIES', 2)),
+                backoff_seconds=float(os.getenv('HTTP_BACKOFF_SECONDS', 0.5)),
+                max_queue_seconds=float(os.getenv('HTTP_MAX_QUEUE_SECONDS', 10)),
+                timeout=float(os.getenv('HTTP_TIMEOUT_SECONDS', 10)),
+                origin_override=(FIXED_ORIGINS[name], override_url) if override_url else None,
+                quota=RollingQuota(per_day) if per_day > 0 else None
+            )
+
+    def session(self, name):
+        return self.sessions[name]
+
+    def daily_quota(self, name):
+        """Requests per day allowed for an upstream, or None when it has no daily cap"""
+        quota = self.sessions[name].quota
+        return quota.limit if quota else None
+
+    def stats(self):
+        stats = {name: session.metrics.stats() for name, session in self.sessions.items()}
+        for name, session in self.sessions.items():
+            if session.quota:
+                stats[name]['daily_quota_remaining'] = session.quota.remaining
+        stats['retry_budget'] = round(self.retry_budget.balance, 2)
+        return stats
+
+
+class FredClient:
+    """Minimal FRED client over a shared session; get_series mirrors fredapi's"""
+
+    def __init__(self, api_key, session, base_url='https://api.stlouisfed.org/fred'):
+        self.api_key = api_key
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+
+    def get_series(self, series_id, observation_start=None):
+        """Observations of a series as a float Series indexed by date; missing values are NaN"""
+        params = {'series_id': series_id, 'api_key': self.api_key, 'file_type': 'json'}
+        if observation_start is not None:
+            params['observation_start'] = pd.Timestamp(observation_start).strftime('%Y-%m-%d')
+        response = self.session.get(f"{self.base_url}/series/observations", params=params)
+        response.raise_for_status()
+        observations = response.json().get('observations', [])
+        return pd.Series(
+            pd.to_numeric([observation['value'] for observation in observations], errors='coerce'),
+            index=pd.to_datetime([observation['date'] for observation in observations]),
+            dtype=float
+        )
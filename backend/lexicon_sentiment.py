@@ -0,0 +1,289 @@
+import itertools
+import math
+import string
+import sys
+import time
+
+from vaderSentiment import vaderSentiment as vader
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from textblob.en import sentiment as pattern_sentiment
+
+# Token flags in the compiled table
+IN_LEXICON = 1
+IS_BOOSTER = 2
+IS_NEGATION = 4
+
+
+class LexiconSentimentScorer:
+    """Batch VADER compound scoring from lookup tables compiled once from the VADER lexicon and rules
+
+    Follows SentimentIntensityAnalyzer.polarity_scores rule for rule, but lower-cases and classifies
+    each token once per text instead of once per rule check, skips texts without a lexicon token
+    outright and scores duplicate texts in a batch once.
+    """
+
+    def __init__(self, analyzer=None):
+        analyzer = analyzer or SentimentIntensityAnalyzer()
+        self.lexicon = analyzer.lexicon
+        self.boosters = vader.BOOSTER_DICT
+        self.special_cases = vader.SPECIAL_CASES
+        self.negations = set(vader.NEGATE)
+
+        # token (lower-cased) -> flags; tokens absent from the table have no effect on their own
+        self.token_flags = {}
+        for word in self.lexicon:
+            self.token_flags[word] = self.token_flags.get(word, 0) | IN_LEXICON
+        for word in self.boosters:
+            self.token_flags[word] = self.token_flags.get(word, 0) | IS_BOOSTER
+        for word in self.negations:
+            self.token_flags[word] = self.token_flags.get(word, 0) | IS_NEGATION
+
+        # Single-character emojis expand to their descriptions, as polarity_scores does
+        emojis = getattr(analyzer, 'emojis', {})
+        self.emoji_table = {ord(emoji): f" {description}" for emoji, description in emojis.items() if len(emoji) == 1}
+
+    def compound(self, text):
+        """VADER compound score of one text"""
+        if not isinstance(text, str):
+            text = str(text)
+        if not text.isascii():
+            text = text.translate(self.emoji_table)
+        text = text.strip()
+
+        words = [self._strip_punc_if_word(token) for token in text.split()]
+        lowers = [word.lower() for word in words]
+        flags = [self.token_flags.get(word, 0) for word in lowers]
+        if not any(flag & IN_LEXICON for flag in flags):
+            return 0.0  # Only lexicon words carry valence; every rule scales or replaces it
+
+        allcaps = [word.isupper() for word in words]
+        allcap_words = sum(allcaps)
+        is_cap_diff = 0 < len(words) - allcap_words < len(words)
+
+        sentiments = []
+        for i, word_lower in enumerate(lowers):
+            if flags[i] & IS_BOOSTER:
+                sentiments.append(0)
+                continue
+            if i < len(lowers) - 1 and word_lower == "kind" and lowers[i + 1] == "of":
+                sentiments.append(0)
+                continue
+            sentiments.append(self._valence(words, lowers, flags, allcaps, is_cap_diff, i))
+
+        sentiments = self._but_check(lowers, sentiments)
+        return self._score(sentiments, text)
+
+    def compound_many(self, texts):
+        """VADER compound scores aligned with `texts`; repeated texts are scored once"""
+        scores = {}
+        results = []
+        for text in texts:
+            score = scores.get(text)
+            if score is None:
+                score = scores[text] = self.compound(text)
+            results.append(score)
+        return results
+
+    @staticmethod
+    def _strip_punc_if_word(token):
+        stripped = token.strip(string.punctuation)
+        return token if len(stripped) <= 2 else stripped
+
+    def _valence(self, words, lowers, flags, allcaps, is_cap_diff, i):
+        word_lower = lowers[i]
+        if not flags[i] & IN_LEXICON:
+            return 0
+        valence = self.lexicon[word_lower]
+
+        # "no" directly before a lexicon word negates it rather than counting on its own
+        if word_lower == "no" and i != len(lowers) - 1 and flags[i + 1] & IN_LEXICON:
+            valence = 0.0
+        if (i > 0 and lowers[i - 1] == "no") or (i > 1 and lowers[i - 2] == "no") or (
+                i > 2 and lowers[i - 3] == "no" and lowers[i - 1] in ("or", "nor")):
+            valence = self.lexicon[word_lower] * vader.N_SCALAR
+
+        # Sentiment-laden word in ALL CAPS while others are not
+        if allcaps[i] and is_cap_diff:
+            valence = valence + vader.C_INCR if valence > 0 else valence - vader.C_INCR
+
+        for start_i in range(0, 3):
+            j = i - (start_i + 1)
+            if i > start_i and not flags[j] & IN_LEXICON:
+                s = self._scalar_inc_dec(words[j], lowers[j], flags[j], allcaps[j], valence, is_cap_diff)
+                if start_i == 1 and s != 0:
+                    s = s * 0.95
+                if start_i == 2 and s != 0:
+                    s = s * 0.9
+                valence = valence + s
+                valence = self._negation_check(valence, lowers, flags, start_i, i)
+                if start_i == 2:
+                    valence = self._special_idioms_check(valence, lowers, i)
+
+        return self._least_check(valence, lowers, flags, i)
+
+    def _scalar_inc_dec(self, word, word_lower, flag, allcap, valence, is_cap_diff):
+        if not flag & IS_BOOSTER:
+            return 0.0
+        scalar = self.boosters[word_lower]
+        if valence < 0:
+            scalar *= -1
+        if allcap and is_cap_diff:
+            scalar = scalar + vader.C_INCR if valence > 0 else scalar - vader.C_INCR
+        return scalar
+
+    @staticmethod
+    def _negated(word_lower, flag):
+        return bool(flag & IS_NEGATION) or "n't" in word_lower
+
+    def _negation_check(self, valence, lowers, flags, start_i, i):
+        if start_i == 0:
+            if self._negated(lowers[i - 1], flags[i - 1]):
+                valence = valence * vader.N_SCALAR
+        elif start_i == 1:
+            if lowers[i - 2] == "never" and lowers[i - 1] in ("so", "this"):
+                valence = valence * 1.25
+            elif lowers[i - 2] == "without" and lowers[i - 1] == "doubt":
+                pass
+            elif self._negated(lowers[i - 2], flags[i - 2]):
+                valence = valence * vader.N_SCALAR
+        else:
+            if (lowers[i - 3] == "never" and lowers[i - 2] in ("so", "this")) or lowers[i - 1] in ("so", "this"):
+                valence = valence * 1.25
+            elif lowers[i - 3] == "without" and (lowers[i - 2] == "doubt" or lowers[i - 1] == "doubt"):
+                pass
+            elif self._negated(lowers[i - 3], flags[i - 3]):
+                valence = valence * vader.N_SCALAR
+        return valence
+
+    def _special_idioms_check(self, valence, lowers, i):
+        onezero = f"{lowers[i - 1]} {lowers[i]}"
+        twoonezero = f"{lowers[i - 2]} {lowers[i - 1]} {lowers[i]}"
+        twoone = f"{lowers[i - 2]} {lowers[i - 1]}"
+        threetwoone = f"{lowers[i - 3]} {lowers[i - 2]} {lowers[i - 1]}"
+        threetwo = f"{lowers[i - 3]} {lowers[i - 2]}"
+
+        for sequence in (onezero, twoonezero, twoone, threetwoone, threetwo):
+            if sequence in self.special_cases:
+                valence = self.special_cases[sequence]
+                break
+        if len(lowers) - 1 > i:
+            zeroone = f"{lowers[i]} {lowers[i + 1]}"
+            if zeroone in self.special_cases:
+                valence = self.special_cases[zeroone]
+        if len(lowers) - 1 > i + 1:
+            zeroonetwo = f"{lowers[i]} {lowers[i + 1]} {lowers[i + 2]}"
+            if zeroonetwo in self.special_cases:
+                valence = self.special_cases[zeroonetwo]
+
+        # Booster/dampener n-grams such as "sort of" or "kind of"
+        for n_gram in (threetwoone, threetwo, twoone):
+            if n_gram in self.boosters:
+                valence = valence + self.boosters[n_gram]
+        return valence
+
+    @staticmethod
+    def _least_check(valence, lowers, flags, i):
+        if i > 1 and lowers[i - 1] == "least" and not flags[i - 1] & IN_LEXICON:
+            if lowers[i - 2] != "at" and lowers[i - 2] != "very":
+                valence = valence * vader.N_SCALAR
+        elif i > 0 and lowers[i - 1] == "least" and not flags[i - 1] & IN_LEXICON:
+            valence = valence * vader.N_SCALAR
+        return valence
+
+    @staticmethod
+    def _but_check(lowers, sentiments):
+        # Mirrors VADER exactly, including its lookup of each sentiment by value
+        if 'but' in lowers:
+            bi = lowers.index('but')
+            for sentiment in sentiments:
+                si = sentiments.index(sentiment)
+                if si < bi:
+                    sentiments.pop(si)
+                    sentiments.insert(si, sentiment * 0.5)
+                elif si > bi:
+                    sentiments.pop(si)
+                    sentiments.insert(si, sentiment * 1.5)
+        return sentiments
+
+    @staticmethod
+    def _score(sentiments, text):
+        if not sentiments:
+            return 0.0
+        sum_s = float(sum(sentiments))
+
+        # Emphasis from exclamation and question marks
+        ep_count = min(text.count("!"), 4)
+        qm_count = text.count("?")
+        amplifier = ep_count * 0.292
+        if qm_count > 1:
+            amplifier += qm_count * 0.18 if qm_count <= 3 else 0.96
+        if sum_s > 0:
+            sum_s += amplifier
+        elif sum_s < 0:
+            sum_s -= amplifier
+
+        compound = sum_s / math.sqrt(sum_s * sum_s + 15)
+        return round(max(-1.0, min(1.0, compound)), 4)
+
+
+def textblob_polarity_many(texts):
+    """TextBlob polarity aligned with `texts`, calling the pattern analyzer directly once per distinct text"""
+    scores = {}
+    results = []
+    for text in texts:
+        score = scores.get(text)
+        if score is None:
+            # What TextBlob(text).sentiment.polarity computes, without building a TextBlob per text
+            score = scores[text] = pattern_sentiment(text)[0]
+        results.append(score)
+    return results
+
+
+def benchmark(texts, tolerance=1e-3):
+    """Compare batch scoring with per-call polarity_scores: agreement and throughput"""
+    analyzer = SentimentIntensityAnalyzer()
+    scorer = LexiconSentimentScorer(analyzer)
+
+    start = time.perf_counter()
+    reference = [analyzer.polarity_scores(text)['compound'] for text in texts]
+    reference_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [scorer.compound(text) for text in texts]
+    compiled_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scorer.compound_many(texts)
+    batch_seconds = time.perf_counter() - start
+
+    errors = [abs(a - b) for a, b in zip(reference, compiled)]
+    mismatches = sum(error > tolerance for error in errors)
+    print(f"{len(texts)} texts, {len(set(texts))} distinct")
+    for name, seconds in (('polarity_scores loop', reference_seconds), ('compiled compound', compiled_seconds),
+                          ('compound_many', batch_seconds)):
+        print(f"  {name:<21} {seconds:.3f}s ({len(texts) / max(seconds, 1e-9):,.0f}/s)")
+    print(f"  max abs difference {max(errors, default=0):.6f}, {mismatches} over tolerance {tolerance}")
+    return mismatches == 0
+
+
+def distinct_texts(headlines, count):
+    """Up to `count` distinct texts joining pairs of headlines under VADER modifiers
+    
+    The historical CSV repeats a handful of headlines, so timing it directly measures compound_many's
+    duplicate memo rather than scoring.
+    """
+    headlines = list(dict.fromkeys(headlines))
+    modifiers = ('', 'Very ', 'Not ', 'Kind of ', 'EXTREMELY ', 'Hardly ')
+    joins = ('. ', ' but ', ', and ')
+    texts = (f"{modifier}{first}{join}{second}"
+             for modifier in modifiers for join in joins for first in headlines for second in headlines)
+    return list(itertools.islice(texts, count))
+
+
+# Agreement and speed against VADER on texts built from the historical headlines
+if __name__ == "__main__":
+    from historical_store import HistoricalStore
+
+    df = HistoricalStore().load(columns=['title/text'])
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    sys.exit(0 if benchmark(distinct_texts(df['title/text'].astype(str).tolist(), count)) else 1)
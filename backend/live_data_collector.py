@@ -3,16 +3,37 @@ import requests
 import praw
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from textblob import TextBlob
+from datetime import datetime, timedelta, timezone
 from newsapi import NewsApiClient
-from fredapi import Fred
+from http_transport import HttpTransport, FredClient
+from circuit_breaker import CircuitBreaker
+from economic_series_store import EconomicSeriesStore
+from scoring_pipeline import ScoringPipeline
+from article_store import ArticleStore, item_key
 import json
 import time
+import random
+import re
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+
+# Snapshot of a symbol nothing has been published for yet
+EMPTY_SNAPSHOT = MappingProxyType({
+    'news': (),
+    'social': (),
+    'economic': MappingProxyType({}),
+    'version': 0,
+    'updated_at': None
+})
+
+# Snapshot key for symbol-independent results
+MARKET_SNAPSHOT = '*'
+
 
 class LiveDataCollector:
-    def __init__(self):
+    def __init__(self, scoring_pipeline=None, article_store=None):
         # Company mapping for better search results
         self.company_map = {
             'AAPL': {'name': 'Apple Inc', 'keywords': ['Apple', 'iPhone', 'iPad', 'Mac', 'iOS']},
@@ -30,16 +51,50 @@ class LiveDataCollector:
         # Load configuration
         self.load_config()
         
-        # Initialize sentiment analyzer
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
+        # Single scoring stage: VADER, TextBlob and (once attached) ML signals computed once per item
+        self.scoring_pipeline = scoring_pipeline or ScoringPipeline()
         
         # Initialize APIs
         self.init_apis()
         
-        # Storage for collected data
-        self.news_data = []
-        self.social_data = []
-        self.economic_data = []
+        # Spread NewsAPI's daily quota over the configured symbols: seconds between upstream news fetches per symbol
+        news_quota = self.transport.daily_quota('newsapi')
+        default_news_refresh = 86400 * len(self.company_map) / news_quota if news_quota else 0
+        self.news_refresh_seconds = float(os.getenv('NEWS_REFRESH_SECONDS', default_news_refresh))
+        self._news_fetched_at = {}  # symbol -> monotonic time of the last successful upstream news fetch
+        
+        # Latest results per symbol as immutable snapshots: writers swap them in under a lock,
+        # readers take the current reference without locking
+        self._snapshots = {}
+        self._snapshot_lock = threading.Lock()
+        self.news_version = 0  # Bumped whenever any symbol publishes news
+        
+        # Callbacks notified with each batch of newly processed items
+        self.observers = []
+        self._notified = OrderedDict()  # Recently notified item keys; overlapping fetch windows repeat items
+        self._notified_lock = threading.Lock()
+        self.notified_capacity = 50000
+        
+        # Worker pools for concurrent source fetches and individual FRED series
+        self.executor = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix='fetch')
+        self.series_executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix='fred')
+        self.reddit_executor = ThreadPoolExecutor(max_workers=self.reddit_max_concurrency, thread_name_prefix='reddit')
+        self.batch_executor = ThreadPoolExecutor(max_workers=self.batch_max_concurrency, thread_name_prefix='batch')
+        self.probe_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='probe')
+        
+        # One breaker per upstream source; open sources answer from the last good value
+        self.breakers = {
+            source: CircuitBreaker(source, self.breaker_failures, self.breaker_reset_seconds)
+            for source in ('news', 'social', 'economic')
+        }
+        self._last_good = {}  # (source, symbol) -> (score, items, fetched_at)
+        
+        # Local FRED series store; symbol-independent and refreshed incrementally
+        self.series_store = EconomicSeriesStore(refresh_hours=self.fred_refresh_hours)
+        
+        # Every scored article and post; items seen in an earlier fetch are never rescored
+        self.article_store = article_store or ArticleStore()
+        self.history_days = 7
     
     def load_config(self):
         """Load configuration from config.env file"""
@@ -58,23 +113,85 @@ class LiveDataCollector:
         self.reddit_client_secret = os.getenv('REDDIT_CLIENT_SECRET', '')
         self.reddit_user_agent = os.getenv('REDDIT_USER_AGENT', 'MarketSentiment/1.0')
         self.fred_api_key = os.getenv('FRED_API_KEY', 'demo_key')
+        
+        # Concurrent fetch settings; each source degrades on its own past its deadline
+        self.concurrent_fetch = os.getenv('CONCURRENT_FETCH', 'true').lower() == 'true'
+        self.fetch_workers = int(os.getenv('FETCH_WORKERS', 8))
+        self.source_timeouts = {
+            'news': float(os.getenv('NEWS_TIMEOUT_SECONDS', 8)),
+            'social': float(os.getenv('SOCIAL_TIMEOUT_SECONDS', 8)),
+            'economic': float(os.getenv('ECONOMIC_TIMEOUT_SECONDS', 6))
+        }
+        
+        # Reddit fan-out: "subreddit:limit" pairs, bounded concurrency and a shared post budget
+        self.reddit_subreddits = self.parse_subreddit_limits(os.getenv(
+            'REDDIT_SUBREDDITS', 'stocks:5,investing:5,SecurityAnalysis:5,financialindependence:5,StockMarket:5'
+        ))
+        self.reddit_max_concurrency = int(os.getenv('REDDIT_MAX_CONCURRENCY', 4))
+        self.social_post_budget = int(os.getenv('SOCIAL_POST_BUDGET', 30))
+        
+        # Multi-symbol batches: symbols fetched at once and the deadline for the whole batch
+        self.batch_max_concurrency = int(os.getenv('BATCH_MAX_CONCURRENCY', 4))
+        self.batch_timeout = float(os.getenv('BATCH_TIMEOUT_SECONDS', 20))
+        
+        # Circuit breakers: consecutive failures before a source opens, seconds before it is probed again
+        self.breaker_failures = int(os.getenv('BREAKER_FAILURE_THRESHOLD', 3))
+        self.breaker_reset_seconds = float(os.getenv('BREAKER_RESET_SECONDS', 30))
+        
+        # Per-series FRED refresh intervals, e.g. "GDP:24,UNRATE:12" (hours)
+        self.fred_refresh_hours = {
+            series_id: float(hours)
+            for series_id, hours in (
+                entry.split(':', 1) for entry in os.getenv('FRED_REFRESH_HOURS', '').split(',') if ':' in entry
+            )
+        }
+        
+        # Optional endpoint overrides, e.g. to point PRAW at a local fake Reddit
+        self.reddit_url = os.getenv('REDDIT_URL', '')
+        self.reddit_oauth_url = os.getenv('REDDIT_OAUTH_URL', '')
+        self.fred_url = os.getenv('FRED_URL', 'https://api.stlouisfed.org/fred')
+        
+        # Seeded mock data and fallback scores for repeatable offline runs; unseeded by default
+        self.mock_seed = os.getenv('MOCK_SEED')
+        self._mock_rngs = {}
+        self._mock_rng_lock = threading.Lock()
+    
+    def parse_subreddit_limits(self, value):
+        """Parse "stocks:5,investing:10" into [(subreddit, limit)] pairs"""
+        subreddits = []
+        for entry in value.split(','):
+            entry = entry.strip()
+            if not entry:
+                continue
+            name, _, limit = entry.partition(':')
+            subreddits.append((name.strip(), int(limit) if limit.strip() else 5))
+        return subreddits
     
     def init_apis(self):
         """Initialize API clients"""
+        # Pooled, rate-limited sessions shared by every client of each upstream
+        self.transport = HttpTransport()
         try:
             # News API
             if self.news_api_key != 'demo_key':
-                self.newsapi = NewsApiClient(api_key=self.news_api_key)
+                self.newsapi = NewsApiClient(api_key=self.news_api_key, session=self.transport.session('newsapi'))
             else:
                 self.newsapi = None
                 print("Warning: News API key not configured. Using mock data.")
             
             # Reddit API
             if self.reddit_client_id and self.reddit_client_secret:
+                reddit_kwargs = {}
+                if self.reddit_url:
+                    reddit_kwargs['reddit_url'] = self.reddit_url
+                if self.reddit_oauth_url:
+                    reddit_kwargs['oauth_url'] = self.reddit_oauth_url
                 self.reddit = praw.Reddit(
                     client_id=self.reddit_client_id,
                     client_secret=self.reddit_client_secret,
-                    user_agent=self.reddit_user_agent
+                    user_agent=self.reddit_user_agent,
+                    requestor_kwargs={'session': self.transport.session('reddit')},
+                    **reddit_kwargs
                 )
             else:
                 self.reddit = None
@@ -82,7 +199,7 @@ class LiveDataCollector:
             
             # FRED API
             if self.fred_api_key != 'demo_key':
-                self.fred = Fred(api_key=self.fred_api_key)
+                self.fred = FredClient(self.fred_api_key, self.transport.session('fred'), self.fred_url)
             else:
                 self.fred = None
                 print("Warning: FRED API key not configured. Using mock data.")
@@ -90,8 +207,90 @@ class LiveDataCollector:
         except Exception as e:
             print(f"Error initializing APIs: {e}")
     
+    def add_observer(self, callback):
+        """Register callback(symbol, source, items) for newly processed articles and posts"""
+        self.observers.append(callback)
+    
+    def notify_observers(self, symbol, source, items):
+        """Hand items not seen in earlier fetches to registered observers"""
+        if not self.observers:
+            return
+        new_items = []
+        with self._notified_lock:
+            for item in items:
+                key = (symbol, source, item.get('url') or item.get('title'))
+                if key in self._notified:
+                    continue
+                self._notified[key] = True
+                new_items.append(item)
+            while len(self._notified) > self.notified_capacity:
+                self._notified.popitem(last=False)
+        if not new_items:
+            return
+        
+        for callback in self.observers:
+            try:
+                callback(symbol, source, new_items)
+            except Exception as e:
+                print(f"Error notifying observer: {e}")
+    
+    def publish_snapshot(self, symbol, **sections):
+        """Atomically replace a symbol's snapshot with a copy that has the given news/social/economic sections"""
+        frozen = {}
+        for name, value in sections.items():
+            frozen[name] = MappingProxyType(dict(value)) if name == 'economic' else tuple(value)
+        
+        with self._snapshot_lock:
+            current = self._snapshots.get(symbol, EMPTY_SNAPSHOT)
+            snapshot = MappingProxyType(dict(current, **frozen, version=current['version'] + 1, updated_at=time.time()))
+            # Copy-on-write: the published dict is never mutated, so lock-free readers see old or new, never partial
+            snapshots = dict(self._snapshots)
+            snapshots[symbol] = snapshot
+            self._snapshots = snapshots
+            if 'news' in sections:
+                self.news_version += 1
+        return snapshot
+    
+    def snapshot(self, symbol):
+        """Latest published snapshot for a symbol; never blocks on writers"""
+        return self._snapshots.get(symbol, EMPTY_SNAPSHOT)
+    
     def fetch_news_sentiment(self, symbol='AAPL', company_name=None):
         """Fetch news and calculate sentiment"""
+        score, articles, age = self.fetch_source('news', symbol, company_name)
+        if age == 0:
+            self.publish_snapshot(symbol, news=articles)
+        return score
+    
+    def store_new_items(self, symbol, source, records, texts, score):
+        """Score and store only the records the article store has not seen; returns the new records
+        
+        `score(records, texts)` attaches scores to the new records before they are stored.
+        """
+        keyed = {}
+        for record, text in zip(records, texts):
+            keyed.setdefault(item_key(record, text), (record, text))  # Duplicates within one fetch count once
+        known = self.article_store.known(symbol, source, keyed)
+        new = [(key, record, text) for key, (record, text) in keyed.items() if key not in known]
+        
+        if new:
+            score([record for _, record, _ in new], [text for _, _, text in new])
+            self.article_store.insert(symbol, source, [(key, record) for key, record, _ in new])
+        return [record for _, record, _ in new]
+    
+    def stored_window(self, symbol, source, limit):
+        """Newest stored items for a symbol and source within the history window"""
+        # Stored publish times are UTC, so the floor must be too
+        since = (datetime.now(timezone.utc) - timedelta(days=self.history_days)).strftime('%Y-%m-%dT%H:%M:%S')
+        return self.article_store.recent(source, limit, symbol, since)
+    
+    def news_due(self, symbol):
+        """Whether the news cadence allows another upstream NewsAPI request for a symbol"""
+        fetched_at = self._news_fetched_at.get(symbol)
+        return fetched_at is None or time.monotonic() - fetched_at >= self.news_refresh_seconds
+    
+    def collect_news(self, symbol='AAPL', company_name=None):
+        """Fetch and score news, returning (score, processed articles)"""
         try:
             # Get company info from mapping
             if symbol in self.company_map:
@@ -104,55 +303,67 @@ class LiveDataCollector:
                 company_name = company_name or symbol
                 query = f"{symbol} OR {company_name} OR stock market OR financial"
             
-            if self.newsapi:
+            if self.newsapi and not self.news_due(symbol):
+                # Fetched within the quota-derived cadence: rescore the stored window without spending a request
+                articles = []
+            elif self.newsapi:
+                # Only ask for articles published since the newest stored one, with an hour of overlap
+                from_time = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=self.history_days)  # NewsAPI reads `from` as UTC
+                cursor = self.article_store.since(symbol, 'news')
+                if cursor:
+                    try:
+                        cursor_time = datetime.fromisoformat(cursor.replace('Z', '')) - timedelta(hours=1)
+                        from_time = max(from_time, cursor_time)
+                    except ValueError:
+                        pass
+                
                 # Fetch news from News API
                 news = self.newsapi.get_everything(
                     q=query,
                     language='en',
                     sort_by='publishedAt',
                     page_size=30,
-                    from_param=(datetime.now() - timedelta(days=7)).isoformat()
+                    from_param=from_time.strftime('%Y-%m-%dT%H:%M:%S')  # newsapi-python rejects fractional seconds
                 )
                 
                 articles = news['articles']
+                self._news_fetched_at[symbol] = time.monotonic()
             else:
                 # Mock news data
                 articles = self.generate_mock_news(symbol)
             
             # Process news sentiment
-            news_scores = []
             processed_articles = []
+            contents = []
             
             for article in articles[:30]:  # Limit to 30 articles
-                try:
-                    title = article.get('title', '')
-                    description = article.get('description', '')
-                    content = f"{title} {description}"
-                    
-                    if content.strip():
-                        # VADER sentiment
-                        vader_score = self.sentiment_analyzer.polarity_scores(content)['compound']
-                        
-                        # TextBlob sentiment  
-                        blob = TextBlob(content)
-                        textblob_score = blob.sentiment.polarity
-                        
-                        # Average sentiment
-                        avg_sentiment = (vader_score + textblob_score) / 2
-                        news_scores.append(avg_sentiment)
-                        
-                        processed_articles.append({
-                            'title': title,
-                            'description': description,
-                            'source': article.get('source', {}).get('name', 'Unknown'),
-                            'publishedAt': article.get('publishedAt', ''),
-                            'sentiment_score': avg_sentiment,
-                            'url': article.get('url', '')
-                        })
+                title = article.get('title', '') or ''
+                description = article.get('description', '') or ''
+                content = f"{title} {description}"
                 
-                except Exception as e:
-                    print(f"Error processing article: {e}")
-                    continue
+                if content.strip():
+                    contents.append(content)
+                    processed_articles.append({
+                        'title': title,
+                        'description': description,
+                        'source': (article.get('source') or {}).get('name', 'Unknown'),
+                        'publishedAt': article.get('publishedAt', ''),
+                        'url': article.get('url', '')
+                    })
+            
+            def score_articles(new_articles, new_contents):
+                # Every signal for every new article in one pass; the ML score later reuses them
+                self.scoring_pipeline.score_records(new_articles, new_contents)
+                for article in new_articles:
+                    # Average of VADER and TextBlob sentiment
+                    signals = article['signals']
+                    article['sentiment_score'] = (signals['vader'] + signals['textblob']) / 2
+            
+            new_articles = self.store_new_items(symbol, 'news', processed_articles, contents, score_articles)
+            
+            # Score over the newest stored articles: this fetch plus earlier ones still in the window
+            processed_articles = self.stored_window(symbol, 'news', 30)
+            news_scores = [article['sentiment_score'] for article in processed_articles]
             
             # Convert to 2-5 scale (as per Market_Sentiment.py)
             if news_scores:
@@ -161,81 +372,66 @@ class LiveDataCollector:
                 final_score = max(2, min(5, ((avg_score + 1) / 2) * 3 + 2))
             else:
                 # Generate dynamic neutral-ish score in 2-5 range
-                import random
-                final_score = random.uniform(2.5, 3.5)  # Random between 2.5-3.5
+                final_score = self.mock_rng('news', symbol).uniform(2.5, 3.5)  # Random between 2.5-3.5
             
-            self.news_data = processed_articles
-            return round(final_score, 2)
+            self.notify_observers(symbol, 'news', new_articles)
+            return round(final_score, 2), processed_articles
         
         except Exception as e:
             print(f"Error fetching news sentiment: {e}")
-            # Return dynamic score in 2-5 range
-            import random
-            return round(random.uniform(2.5, 3.5), 2)
+            raise
     
     def fetch_social_sentiment(self, symbol='AAPL'):
         """Fetch Reddit sentiment"""
+        score, posts, age = self.fetch_source('social', symbol)
+        if age == 0:
+            self.publish_snapshot(symbol, social=posts)
+        return score
+    
+    def collect_social(self, symbol='AAPL'):
+        """Fetch and score Reddit posts, returning (score, processed posts)"""
         try:
             if self.reddit:
-                # Search multiple finance subreddits
-                subreddits = ['stocks', 'investing', 'SecurityAnalysis', 'financialindependence', 'StockMarket']
-                posts = []
-                
-                # Get search terms for the company
-                search_terms = [symbol]
-                if symbol in self.company_map:
-                    company_name = self.company_map[symbol]['name']
-                    search_terms.append(company_name.split()[0])  # First word of company name
-                
-                for subreddit_name in subreddits:
-                    try:
-                        subreddit = self.reddit.subreddit(subreddit_name)
-                        # Search for symbol and company name mentions
-                        for term in search_terms:
-                            for post in subreddit.search(term, time_filter='week', limit=5):
-                                posts.append({
-                                    'title': post.title,
-                                    'selftext': post.selftext,
-                                    'score': post.score,
-                                    'created_utc': post.created_utc,
-                                    'subreddit': subreddit_name
-                                })
-                    except Exception as e:
-                        print(f"Error accessing subreddit {subreddit_name}: {e}")
-                        continue
+                posts = self.search_reddit(symbol)
             else:
                 # Mock social media data
                 posts = self.generate_mock_social(symbol)
             
             # Process social sentiment
-            social_scores = []
             processed_posts = []
+            contents = []
             
-            for post in posts[:30]:  # Limit to 30 posts
-                try:
-                    content = f"{post.get('title', '')} {post.get('selftext', '')}"
-                    
-                    if content.strip():
-                        # VADER sentiment
-                        vader_score = self.sentiment_analyzer.polarity_scores(content)['compound']
-                        
-                        # Weight by post score/upvotes
-                        weight = max(1, min(10, post.get('score', 1)))
-                        weighted_score = vader_score * (weight / 10)
-                        
-                        social_scores.append(weighted_score)
-                        
-                        processed_posts.append({
-                            'title': post.get('title', ''),
-                            'content': post.get('selftext', '')[:200] + '...' if len(post.get('selftext', '')) > 200 else post.get('selftext', ''),
-                            'score': post.get('score', 0),
-                            'subreddit': post.get('subreddit', 'Unknown'),
-                            'sentiment_score': weighted_score
-                        })
+            for post in posts[:self.social_post_budget]:  # Limit to the post budget
+                selftext = post.get('selftext', '') or ''
+                content = f"{post.get('title', '')} {selftext}"
                 
-                except Exception as e:
-                    print(f"Error processing post: {e}")
-                    continue
+                if content.strip():
+                    # Signals are computed on the full text before the content is truncated for display
+                    contents.append(content)
+                    processed_posts.append({
+                        'id': post.get('id'),
+                        'title': post.get('title', ''),
+                        'content': selftext[:200] + '...' if len(selftext) > 200 else selftext,
+                        'score': post.get('score', 0),
+                        'subreddit': post.get('subreddit', 'Unknown'),
+                        'created_utc': post.get('created_utc')
+                    })
+            
+            def score_posts(new_posts, new_contents):
+                self.scoring_pipeline.score_records(new_posts, new_contents, signals=('ml', 'vader'))
+                for post in new_posts:
+                    vader_score = post['signals']['vader']
+                    
+                    # Weight by post score/upvotes
+                    weight = max(1, min(10, post.get('score', 1)))
+                    post['sentiment_score'] = vader_score * (weight / 10)
+                    post['raw_sentiment_score'] = vader_score
+            
+            new_posts = self.store_new_items(symbol, 'social', processed_posts, contents, score_posts)
+            
+            # Score over the newest stored posts: this fetch plus earlier ones still in the window
+            processed_posts = self.stored_window(symbol, 'social', self.social_post_budget)
+            social_scores = [post['sentiment_score'] for post in processed_posts]
             
             # Convert to 2-5 scale (as per Market_Sentiment.py)
             if social_scores:
@@ -244,28 +440,89 @@ class LiveDataCollector:
                 final_score = max(2, min(5, ((avg_score + 1) / 2) * 3 + 2))
             else:
                 # Generate dynamic neutral-ish score in 2-5 range
-                import random
-                final_score = random.uniform(2.7, 3.3)  # Random between 2.7-3.3
+                final_score = self.mock_rng('social', symbol).uniform(2.7, 3.3)  # Random between 2.7-3.3
             
-            self.social_data = processed_posts
-            return round(final_score, 2)
+            self.notify_observers(symbol, 'social', new_posts)
+            return round(final_score, 2), processed_posts
         
         except Exception as e:
             print(f"Error fetching social sentiment: {e}")
-            # Return dynamic score in 2-5 range
-            import random
-            return round(random.uniform(2.6, 3.4), 2)
+            raise
+    
+    def search_reddit(self, symbol):
+        """Search finance subreddits in parallel, deduping posts and stopping at the post budget"""
+        # Get search terms for the company
+        search_terms = [symbol]
+        if symbol in self.company_map:
+            company_name = self.company_map[symbol]['name']
+            search_terms.append(company_name.split()[0])  # First word of company name
+        
+        posts = []
+        seen_ids = set()
+        failures = []
+        lock = threading.Lock()
+        budget_met = threading.Event()
+        
+        def run_search(subreddit_name, term, limit):
+            try:
+                for post in self.reddit.subreddit(subreddit_name).search(term, time_filter='week', limit=limit):
+                    if budget_met.is_set():
+                        return
+                    with lock:
+                        # The same post often matches both the symbol and the company name
+                        if post.id in seen_ids:
+                            continue
+                        seen_ids.add(post.id)
+                        posts.append({
+                            'id': post.id,
+                            'title': post.title,
+                            'selftext': post.selftext,
+                            'score': post.score,
+                            'created_utc': post.created_utc,
+                            'subreddit': subreddit_name
+                        })
+                        if len(posts) >= self.social_post_budget:
+                            budget_met.set()
+                            return
+            except Exception as e:
+                print(f"Error searching subreddit {subreddit_name} for {term}: {e}")
+                with lock:
+                    failures.append(e)
+        
+        futures = [
+            self.reddit_executor.submit(run_search, subreddit_name, term, limit)
+            for subreddit_name, limit in self.reddit_subreddits
+            for term in search_terms
+        ]
+        for _ in as_completed(futures):
+            if budget_met.is_set():
+                break
+        
+        # Searches that have not started yet are dropped once the budget is met
+        for future in futures:
+            future.cancel()
+        
+        with lock:
+            # Reddit is down, not merely quiet, when every search failed
+            if failures and len(failures) == len(futures) and not posts:
+                raise failures[0]
+            return list(posts)
     
     def fetch_economic_sentiment(self):
         """Fetch economic indicators and calculate sentiment"""
+        score, indicators, age = self.fetch_source('economic', MARKET_SNAPSHOT)
+        if age == 0:
+            self.publish_snapshot(MARKET_SNAPSHOT, economic=indicators)
+        return score
+    
+    def fetch_series_observations(self, series_id, start_date):
+        """Fetch FRED observations for one series from start_date onwards"""
+        return self.fred.get_series(series_id, observation_start=start_date)
+    
+    def collect_economic(self):
+        """Fetch economic indicators, returning (score, indicators)"""
         try:
             if self.fred:
-                # Fetch key economic indicators
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=90)
-                
-                indicators = {}
-                
                 # Key economic indicators
                 economic_series = {
                     'GDP': 'GDP',
@@ -275,25 +532,22 @@ class LiveDataCollector:
                     'CONSUMER_CONFIDENCE': 'UMCSENT'
                 }
                 
-                for name, series_id in economic_series.items():
-                    try:
-                        data = self.fred.get_series(series_id, start_date, end_date)
-                        if not data.empty:
-                            indicators[name] = {
-                                'current': data.iloc[-1],
-                                'previous': data.iloc[-2] if len(data) > 1 else data.iloc[-1],
-                                'trend': 'up' if len(data) > 1 and data.iloc[-1] > data.iloc[-2] else 'down'
-                            }
-                    except Exception as e:
-                        print(f"Error fetching {name}: {e}")
-                        continue
+                # Served from the local series store; only due series are refreshed, in parallel.
+                # Leave headroom so the indicator set beats the outer economic deadline
+                indicators = self.series_store.get_indicators(
+                    economic_series,
+                    self.fetch_series_observations,
+                    self.series_executor,
+                    timeout=self.source_timeouts['economic'] * 0.8
+                )
+                if not indicators:
+                    # Every refresh failed with nothing stored yet: a failure for the breaker, not a neutral success
+                    raise RuntimeError("no FRED indicators available")
             else:
                 # Mock economic data
                 indicators = self.generate_mock_economic()
             
             # Calculate economic sentiment score
-            import random
-            
             if indicators:
                 positive_indicators = 0
                 total_indicators = 0
@@ -316,24 +570,110 @@ class LiveDataCollector:
                     ratio = positive_indicators / total_indicators
                     sentiment_score = ratio * 3 + 2  # Scale to 2-5 range
                     # Add some randomness to avoid exact same scores
-                    sentiment_score += random.uniform(-0.2, 0.2)
+                    sentiment_score += self.mock_rng('economic').uniform(-0.2, 0.2)
                     sentiment_score = max(2, min(5, sentiment_score))
                 else:
-                    sentiment_score = random.uniform(2.8, 3.2)  # Dynamic neutral in 2-5 range
+                    sentiment_score = self.mock_rng('economic').uniform(2.8, 3.2)  # Dynamic neutral in 2-5 range
             else:
-                sentiment_score = random.uniform(2.5, 3.5)  # Dynamic fallback in 2-5 range
+                sentiment_score = self.mock_rng('economic').uniform(2.5, 3.5)  # Dynamic fallback in 2-5 range
             
-            self.economic_data = indicators
-            return round(sentiment_score, 2)
+            return round(sentiment_score, 2), indicators
         
         except Exception as e:
             print(f"Error fetching economic sentiment: {e}")
-            # Return dynamic score in 2-5 range
-            import random
-            return round(random.uniform(2.4, 3.6), 2)
+            raise
+    
+    def collect_source(self, source, symbol, company_name=None):
+        """(score, items) straight from one upstream source; raises when the upstream fails"""
+        if source == 'news':
+            return self.collect_news(symbol, company_name)
+        elif source == 'social':
+            return self.collect_social(symbol)
+        return self.collect_economic()
+    
+    def start_fetch(self, source, symbol, company_name=None):
+        """Submit a source fetch, or return None when its breaker is open"""
+        if not self.breakers[source].allow():
+            self.schedule_probe(source, symbol, company_name)
+            return None
+        return self.executor.submit(self.collect_source, source, symbol, company_name)
+    
+    def finish_fetch(self, source, symbol, future, start):
+        """(score, items, age) of a started fetch within the source's hard deadline
+        
+        Age is 0 for fresh results, the seconds since the last good value when falling back to it,
+        and None when there is no good value yet and the neutral fallback is used.
+        """
+        breaker = self.breakers[source]
+        if future is not None:
+            remaining = max(0, start + self.source_timeouts[source] - time.monotonic())
+            try:
+                score, items = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                print(f"{source} fetch for {symbol} missed its {self.source_timeouts[source]}s deadline")
+                breaker.record_failure()
+            except Exception as e:
+                print(f"{source} fetch for {symbol} failed: {e}")
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+                self._last_good[(source, symbol)] = (score, items, time.time())
+                return score, items, 0
+        return self.last_good(source, symbol)
+    
+    def fetch_source(self, source, symbol, company_name=None):
+        """Fetch one source behind its breaker and hard deadline"""
+        return self.finish_fetch(source, symbol, self.start_fetch(source, symbol, company_name), time.monotonic())
+    
+    def last_good(self, source, symbol):
+        """(score, items, age in seconds) of the last successful fetch, or the neutral fallback with age None"""
+        entry = self._last_good.get((source, symbol))
+        if entry is None:
+            score, items = self.degraded_result(source, symbol)
+            return score, items, None
+        score, items, fetched_at = entry
+        return score, items, time.time() - fetched_at
+    
+    def schedule_probe(self, source, symbol, company_name=None):
+        """Once an open breaker's reset timeout passes, probe the upstream in the background"""
+        if self.breakers[source].begin_probe():
+            self.probe_executor.submit(self.probe, source, symbol, company_name)
+    
+    def probe(self, source, symbol, company_name=None):
+        """Single trial fetch for a half-open breaker; success closes it, failure reopens it"""
+        print(f"Probing {source} after its circuit opened")
+        self.finish_fetch(source, symbol, self.executor.submit(self.collect_source, source, symbol, company_name),
+                          time.monotonic())
+    
+    def breaker_stats(self):
+        return {source: breaker.stats() for source, breaker in self.breakers.items()}
+    
+    def mock_rng(self, *scope):
+        """Random source for mock data and fallback scores, one stream per scope
+        
+        With MOCK_SEED set, every (source, symbol) scope replays the same sequence each run,
+        whatever order concurrent fetches interleave in.
+        """
+        key = scope if self.mock_seed else ()
+        with self._mock_rng_lock:
+            rng = self._mock_rngs.get(key)
+            if rng is None:
+                rng = self._mock_rngs[key] = random.Random(f"{self.mock_seed}:{':'.join(scope)}" if self.mock_seed else None)
+            return rng
+    
+    def degraded_result(self, source, symbol):
+        """Dynamic neutral-ish score in the 2-5 range and no items for a failed or late source"""
+        rng = self.mock_rng(source, symbol)  # Per symbol, so seeded draws do not depend on fetch order
+        if source == 'news':
+            return round(rng.uniform(2.5, 3.5), 2), []
+        elif source == 'social':
+            return round(rng.uniform(2.6, 3.4), 2), []
+        return round(rng.uniform(2.4, 3.6), 2), {}
     
     def generate_mock_news(self, symbol='AAPL'):
         """Generate mock news data when API is not available"""
+        rng = self.mock_rng('news', symbol)
+        
         # Get company-specific info
         company_name = self.company_map.get(symbol, {}).get('name', symbol)
         
@@ -363,12 +703,15 @@ class LiveDataCollector:
         ]
         
         # Randomly select news with varied sentiment
-        import random
         all_news = [(pos, 'positive') for pos in positive_news] + \
                   [(neg, 'negative') for neg in negative_news] + \
                   [(neut, 'neutral') for neut in neutral_news]
         
-        selected_news = random.sample(all_news, min(5, len(all_news)))
+        selected_news = rng.sample(all_news, min(5, len(all_news)))
+        
+        # Mock headlines repeat, so each hour's fetches get their own identity; otherwise the article
+        # store ignores them as known and the stored window empties once the first ones age out
+        fetch_hour = datetime.now().strftime('%Y%m%d%H')
         
         mock_articles = []
         for i, (title, sentiment_type) in enumerate(selected_news):
@@ -383,16 +726,16 @@ class LiveDataCollector:
             mock_articles.append({
                 'title': title,
                 'description': desc,
-                'source': {'name': random.choice(['Financial Times', 'Bloomberg', 'Reuters', 'WSJ'])},
-                'publishedAt': (datetime.now() - timedelta(hours=i*2)).isoformat(),
-                'url': f'https://example.com/article{i+1}'
+                'source': {'name': rng.choice(['Financial Times', 'Bloomberg', 'Reuters', 'WSJ'])},
+                'publishedAt': (datetime.now(timezone.utc) - timedelta(hours=i*2)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'url': f"https://example.com/{symbol.lower()}/{fetch_hour}/{re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')}"
             })
         
         return mock_articles
     
     def generate_mock_social(self, symbol='AAPL'):
         """Generate mock social media data"""
-        import random
+        rng = self.mock_rng('social', symbol)
         
         # Get company info
         company_name = self.company_map.get(symbol, {}).get('name', symbol)
@@ -426,24 +769,28 @@ class LiveDataCollector:
                    [(title, content, 'bearish') for title, content in bearish_posts] + \
                    [(title, content, 'neutral') for title, content in neutral_posts]
         
-        selected_posts = random.sample(all_posts, min(8, len(all_posts)))
+        selected_posts = rng.sample(all_posts, min(8, len(all_posts)))
+        
+        # One identity per post and hour, as for mock news
+        fetch_hour = datetime.now().strftime('%Y%m%d%H')
         
         mock_posts = []
         for i, (title, content, sentiment_type) in enumerate(selected_posts):
             # Vary scores based on sentiment
             if sentiment_type == 'bullish':
-                score = random.randint(20, 50)
+                score = rng.randint(20, 50)
             elif sentiment_type == 'bearish':
-                score = random.randint(5, 25)  
+                score = rng.randint(5, 25)  
             else:
-                score = random.randint(10, 30)
+                score = rng.randint(10, 30)
                 
             mock_posts.append({
+                'id': f"mock-{symbol.lower()}-{fetch_hour}-{re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')}",
                 'title': title,
                 'selftext': content,
                 'score': score,
                 'created_utc': time.time() - (i * 1800),  # Spread posts over time
-                'subreddit': random.choice(['stocks', 'investing', 'SecurityAnalysis', 'StockMarket'])
+                'subreddit': rng.choice(['stocks', 'investing', 'SecurityAnalysis', 'StockMarket'])
             })
         
         return mock_posts
@@ -458,14 +805,42 @@ class LiveDataCollector:
             'CONSUMER_CONFIDENCE': {'current': 102.3, 'previous': 101.8, 'trend': 'up'}
         }
     
-    def get_comprehensive_sentiment(self, symbol='AAPL', company_name='Apple'):
-        """Get comprehensive sentiment scores from all sources"""
+    def get_comprehensive_sentiment(self, symbol='AAPL', company_name='Apple', economic=None):
+        """Get comprehensive sentiment scores from all sources
+        
+        `economic` is an already fetched (score, indicators, age) triple; batches fetch it once for every symbol.
+        """
         print(f"Collecting sentiment data for {symbol}...")
         
-        # Fetch from all sources
-        news_score = self.fetch_news_sentiment(symbol, company_name)
-        social_score = self.fetch_social_sentiment(symbol)
-        economic_score = self.fetch_economic_sentiment()
+        results = {'economic': economic}
+        sources = ['news', 'social'] if economic is not None else ['news', 'social', 'economic']
+        keys = {'news': symbol, 'social': symbol, 'economic': MARKET_SNAPSHOT}
+        if self.concurrent_fetch:
+            # Fetch all sources in parallel; latency approaches the slowest upstream, not the sum
+            start = time.monotonic()
+            futures = {source: self.start_fetch(source, keys[source], company_name) for source in sources}
+            for source in sources:
+                results[source] = self.finish_fetch(source, keys[source], futures[source], start)
+        else:
+            # Fetch from all sources
+            for source in sources:
+                results[source] = self.fetch_source(source, keys[source], company_name)
+        
+        (news_score, news_articles, news_age), (social_score, social_posts, social_age), \
+            (economic_score, indicators, economic_age) = results['news'], results['social'], results['economic']
+        
+        # Failed, late or short-circuited sources: served from the last good value (with its age),
+        # or degraded to a neutral score when there is none yet
+        ages = {'news': news_age, 'social': social_age, 'economic': economic_age}
+        degraded_sources = [source for source, age in ages.items() if age is None]
+        stale_sources = {source: round(age, 1) for source, age in ages.items() if age}
+        
+        # Publish this symbol's fresh results in one swap; other sources keep their last complete results
+        self.publish_snapshot(symbol, **{
+            name: items for name, items in (
+                ('news', news_articles), ('social', social_posts), ('economic', indicators)
+            ) if ages[name] == 0
+        })
         
         # Calculate overall score
         overall_score = (news_score + social_score + economic_score) / 3
@@ -476,10 +851,48 @@ class LiveDataCollector:
             'economic': economic_score,
             'overall': round(overall_score, 2),
             'timestamp': datetime.now().isoformat(),
-            'news_articles': self.news_data,
-            'social_posts': self.social_data,
-            'economic_indicators': self.economic_data
+            'news_articles': news_articles,
+            'social_posts': social_posts,
+            'economic_indicators': indicators,
+            'degraded_sources': degraded_sources,
+            'stale_sources': stale_sources
+        }
+
+    def get_batch_sentiment(self, symbols, timeout=None):
+        """Live data for many symbols sharing one economic fetch
+        
+        Returns (results by symbol, symbols that missed the batch deadline).
+        """
+        timeout = self.batch_timeout if timeout is None else timeout
+        start = time.monotonic()
+        
+        # FRED indicators are symbol-independent: one fetch serves the whole batch
+        economic = self.fetch_source('economic', MARKET_SNAPSHOT)
+        
+        # Per-symbol news and social fetches, at most batch_max_concurrency symbols at a time
+        futures = {
+            self.batch_executor.submit(
+                self.get_comprehensive_sentiment, symbol, self.company_map.get(symbol, {}).get('name', symbol), economic
+            ): symbol
+            for symbol in symbols
         }
+        results = {}
+        try:
+            for future in as_completed(futures, timeout=max(0, start + timeout - time.monotonic())):
+                symbol = futures[future]
+                try:
+                    results[symbol] = future.result()
+                except Exception as e:
+                    print(f"Batch fetch for {symbol} failed: {e}")
+        except FutureTimeoutError:
+            print(f"Batch of {len(symbols)} symbols missed its {timeout}s deadline")
+        
+        # Symbols still pending keep running and are simply left out of this response
+        missing = [symbol for symbol in symbols if symbol not in results]
+        for future, symbol in futures.items():
+            if symbol in missing:
+                future.cancel()
+        return results, missing
 
 # Test function
 if __name__ == "__main__":
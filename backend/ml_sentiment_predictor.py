@@ -1,4 +1,3 @@
-import pandas as pd
 import numpy as np
 import re
 import string
@@ -7,16 +6,41 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from lexicon_sentiment import LexiconSentimentScorer
+from fast_scorer import CompiledLinearScorer
+from prediction_cache import PredictionCache
+from historical_store import HistoricalStore
 import pickle
 import os
+import threading
 
 class MarketSentimentPredictor:
     def __init__(self):
         self.models = {}
         self.vectorizer = None
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
+        self.lexicon_scorer = LexiconSentimentScorer()
         self.is_trained = False
+        self.artifact_version = None
+        self.fast_scorer = None
+        self._model_lock = threading.Lock()
+        
+        # "fast" scores with the compiled linear engine instead of sklearn
+        self.inference_mode = os.getenv('SENTIMENT_INFERENCE_MODE', 'sklearn')
+        
+        # Predictions keyed by cleaned text and model version
+        self.prediction_cache = PredictionCache(
+            max_entries=int(os.getenv('PREDICTION_CACHE_SIZE', 10000)),
+            ttl_seconds=float(os.getenv('PREDICTION_CACHE_TTL', 3600))
+        )
+        
+        # Everything that affects the fitted models; part of the artifact key
+        self.hyperparameters = {
+            'tfidf': {'max_features': 5000, 'stop_words': 'english'},
+            'logistic_regression': {'random_state': 42},
+            'random_forest': {'n_estimators': 100, 'random_state': 42},
+            'fast_student': {'alpha': 1.0},
+            'split': {'test_size': 0.2, 'random_state': 42}
+        }
         
     def label_sentiment(self, score):
         """Convert numerical sentiment to categorical label"""
@@ -37,15 +61,22 @@ class MarketSentimentPredictor:
         text = re.sub(r"\d+", "", text)  # Remove numbers
         return text.strip()
     
-    def train_models(self):
+    def training_data_path(self):
+        """Locate the historical training data"""
+        df_path = "../market_sentiment_500.csv"
+        if not os.path.exists(df_path):
+            df_path = "market_sentiment_500.csv"  # Fallback path
+        return df_path
+    
+    def training_store(self):
+        """Historical store backed by the training CSV"""
+        return HistoricalStore(csv_path=self.training_data_path())
+    
+    def train_models(self, version=None):
         """Train sentiment prediction models on historical data"""
         try:
             # Load training data
-            df_path = "../market_sentiment_500.csv"
-            if not os.path.exists(df_path):
-                df_path = "market_sentiment_500.csv"  # Fallback path
-            
-            df = pd.read_csv(df_path)
+            df = self.training_store().load(columns=["title/text", "sentiment"])
             print(f"Loaded {len(df)} training samples")
             
             # Prepare data
@@ -60,28 +91,44 @@ class MarketSentimentPredictor:
             
             # Split data
             X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=y
+                X, y, stratify=y, **self.hyperparameters['split']
             )
             
             # Vectorize text
-            self.vectorizer = TfidfVectorizer(max_features=5000, stop_words='english')
-            X_train_vec = self.vectorizer.fit_transform(X_train)
-            X_test_vec = self.vectorizer.transform(X_test)
+            vectorizer = TfidfVectorizer(**self.hyperparameters['tfidf'])
+            X_train_vec = vectorizer.fit_transform(X_train)
+            X_test_vec = vectorizer.transform(X_test)
             
             # Train multiple models
-            self.models = {
-                'logistic_regression': LogisticRegression(random_state=42),
-                'random_forest': RandomForestClassifier(n_estimators=100, random_state=42)
+            models = {
+                'logistic_regression': LogisticRegression(**self.hyperparameters['logistic_regression']),
+                'random_forest': RandomForestClassifier(**self.hyperparameters['random_forest'])
             }
             
             # Train and evaluate models
-            for name, model in self.models.items():
+            for name, model in models.items():
                 model.fit(X_train_vec, y_train)
                 y_pred = model.predict(X_test_vec)
                 accuracy = accuracy_score(y_test, y_pred)
                 print(f"{name} accuracy: {accuracy:.3f}")
             
-            self.is_trained = True
+            # Compile the fast linear engine; the forest is distilled into a linear student
+            try:
+                fast_scorer = CompiledLinearScorer.compile(
+                    vectorizer,
+                    models['logistic_regression'],
+                    models['random_forest'],
+                    X_train_vec,
+                    **self.hyperparameters['fast_student']
+                )
+                fast_pred = np.array(fast_scorer.classes)[np.argmax(fast_scorer.predict_proba(X_test), axis=1)]
+                print(f"fast_linear accuracy: {accuracy_score(y_test, fast_pred):.3f}")
+            except Exception as e:
+                print(f"Error compiling fast scorer: {e}")
+                fast_scorer = None
+            
+            # Swap in the new models only once they are fully fitted
+            self.install_models(vectorizer, models, fast_scorer, version)
             print("Model training completed successfully!")
             
         except Exception as e:
@@ -89,43 +136,99 @@ class MarketSentimentPredictor:
             # Use VADER as fallback
             self.is_trained = False
     
+    def install_models(self, vectorizer, models, fast_scorer=None, version=None):
+        """Atomically swap the serving models and invalidate cached predictions"""
+        with self._model_lock:
+            self.vectorizer = vectorizer
+            self.models = models
+            self.fast_scorer = fast_scorer
+            self.artifact_version = version
+            self.is_trained = True
+        self.prediction_cache.clear()
+    
+    def model_version(self):
+        """Identity of the serving model and inference path; predictions from any other version are stale"""
+        return f"{self.artifact_version}:{self.inference_mode}"
+    
+    def serving_models(self):
+        """Consistent snapshot of the serving vectorizer, models and fast scorer"""
+        with self._model_lock:
+            return self.vectorizer, self.models, self.fast_scorer
+    
     def predict_sentiment(self, text):
         """Predict sentiment for a single text"""
-        if not text or not isinstance(text, str):
-            return "neutral", 0.0
-        
-        cleaned_text = self.clean_text(text)
+        return self.predict_sentiment_many([text])[0]
+    
+    def predict_sentiment_many(self, texts):
+        """Predict sentiment for many texts with one vectorizer and model pass"""
+        results = [("neutral", 0.0)] * len(texts)
+        valid = [i for i, text in enumerate(texts) if text and isinstance(text, str)]
+        if not valid:
+            return results
         
-        if self.is_trained and self.vectorizer is not None:
+        if self.is_trained and (self.vectorizer is not None or self.fast_scorer is not None):
             # Use trained ML model
             try:
-                text_vec = self.vectorizer.transform([cleaned_text])
-                
-                # Use ensemble prediction from multiple models
-                predictions = []
-                for model in self.models.values():
-                    pred = model.predict_proba(text_vec)[0]
-                    predictions.append(pred)
+                # Serve repeated headlines from the cache; only genuinely new texts reach the models
+                model_version = self.model_version()
+                pending = {}
+                for i in valid:
+                    cleaned_text = self.clean_text(texts[i])
+                    key = self.prediction_cache.make_key(cleaned_text, model_version)
+                    cached = self.prediction_cache.get(key)
+                    if cached is not None:
+                        results[i] = cached
+                    else:
+                        pending.setdefault(key, (cleaned_text, []))[1].append(i)
                 
-                # Average predictions
-                avg_pred = np.mean(predictions, axis=0)
-                classes = list(self.models['logistic_regression'].classes_)
-                
-                predicted_class = classes[np.argmax(avg_pred)]
-                confidence = np.max(avg_pred)
-                
-                return predicted_class, confidence
+                if pending:
+                    classes, avg_pred = self.predict_proba_cleaned([text for text, _ in pending.values()])
+                    predicted_classes = classes[np.argmax(avg_pred, axis=1)]
+                    confidences = np.max(avg_pred, axis=1)
+                    
+                    for (key, (_, indices)), predicted_class, confidence in zip(pending.items(), predicted_classes, confidences):
+                        prediction = (str(predicted_class), float(confidence))
+                        self.prediction_cache.set(key, prediction)
+                        for i in indices:
+                            results[i] = prediction
+                return results
             
             except Exception as e:
                 print(f"ML prediction error: {e}")
                 # Fallback to VADER
         
-        # Fallback to VADER sentiment
-        vader_score = self.sentiment_analyzer.polarity_scores(text)['compound']
-        sentiment_label = self.label_sentiment(vader_score)
-        confidence = abs(vader_score)
+        # Fallback to VADER sentiment, scored in one batch
+        for i, vader_score in zip(valid, self.lexicon_scorer.compound_many([texts[i] for i in valid])):
+            results[i] = (self.label_sentiment(vader_score), abs(vader_score))
+        
+        return results
+    
+    def predict_proba_cleaned(self, cleaned_texts):
+        """Ensemble class probabilities for already cleaned texts"""
+        vectorizer, models, fast_scorer = self.serving_models()
+        
+        if self.inference_mode == 'fast' and fast_scorer is not None:
+            # Compiled linear engine: token lookups and dot products, no sklearn overhead
+            return np.asarray(fast_scorer.classes), fast_scorer.predict_proba(cleaned_texts)
         
-        return sentiment_label, confidence
+        text_vecs = vectorizer.transform(cleaned_texts)
+        
+        # Use ensemble prediction from multiple models, one predict_proba per model
+        avg_pred = np.mean([model.predict_proba(text_vecs) for model in models.values()], axis=0)
+        return np.asarray(next(iter(models.values())).classes_), avg_pred
+    
+    def to_score_scale(self, predictions):
+        """Map (label, confidence) predictions to the 2-5 scale (as per Market_Sentiment.py)"""
+        if not predictions:
+            return np.array([])
+        
+        labels = np.array([label for label, _ in predictions])
+        confidences = np.array([confidence for _, confidence in predictions], dtype=float)
+        
+        scores = np.full(len(predictions), 3.0)  # Neutral center in 2-5 scale
+        scores = np.where(labels == "positive", 3.5 + (confidences * 1.5), scores)  # 3.5-5 range
+        scores = np.where(labels == "negative", 3.5 - (confidences * 1.5), scores)  # 2-3.5 range
+        return np.clip(scores, 2, 5)
     
     def score_sentiment_batch(self, texts):
         """Score sentiment for multiple texts and return 2-5 scale (as per Market_Sentiment.py)"""
@@ -133,46 +236,66 @@ class MarketSentimentPredictor:
             import random
             return round(random.uniform(2.8, 3.2), 2)  # Dynamic neutral in 2-5 range
         
-        scores = []
-        for text in texts:
-            sentiment_label, confidence = self.predict_sentiment(text)
-            
-            # Convert to numerical score in 2-5 range
-            if sentiment_label == "positive":
-                score = 3.5 + (confidence * 1.5)  # 3.5-5 range
-            elif sentiment_label == "negative":
-                score = 3.5 - (confidence * 1.5)  # 2-3.5 range  
-            else:  # neutral
-                score = 3.0  # Neutral center in 2-5 scale
-            
-            scores.append(max(2, min(5, score)))
+        scores = self.to_score_scale(self.predict_sentiment_many(texts))
         
         # Return average score
-        return round(np.mean(scores), 2)
+        return round(float(np.mean(scores)), 2)
     
     def analyze_live_data(self, news_articles, social_posts, economic_indicators):
         """Analyze live data and return sentiment scores"""
+        return self.analyze_live_data_many([(news_articles, social_posts, economic_indicators)])[0]
+    
+    def analyze_live_data_many(self, batches):
+        """Score several (news_articles, social_posts, economic_indicators) sets with one model batch"""
+        predictions = []
+        pending = []  # (position, text) of records scored before any signals were attached
+        spans = []
+        for news_articles, social_posts, _ in batches:
+            # Analyze news sentiment
+            news_texts = [(article, f"{article.get('title', '')} {article.get('description', '')}") for article in news_articles or []]
+            
+            # Analyze social media sentiment
+            social_texts = [(post, f"{post.get('title', '')} {post.get('content', '')}") for post in social_posts or []]
+            
+            spans.append((len(predictions), len(news_texts), len(social_texts)))
+            for record, text in news_texts + social_texts:
+                prediction = self.prediction_from_signals(record.get('signals'))
+                if prediction is None:
+                    pending.append((len(predictions), text))
+                predictions.append(prediction)
         
-        # Analyze news sentiment
-        news_texts = []
-        if news_articles:
-            for article in news_articles:
-                title = article.get('title', '')
-                description = article.get('description', '')
-                news_texts.append(f"{title} {description}")
-        
-        import random
-        news_score = self.score_sentiment_batch(news_texts) if news_texts else random.uniform(2.5, 3.5)
+        # Records without stored signals are scored together in a single model batch
+        if pending:
+            for (position, _), prediction in zip(pending, self.predict_sentiment_many([text for _, text in pending])):
+                predictions[position] = prediction
+        scores = self.to_score_scale(predictions)
         
-        # Analyze social media sentiment
-        social_texts = []
-        if social_posts:
-            for post in social_posts:
-                title = post.get('title', '')
-                content = post.get('content', '')
-                social_texts.append(f"{title} {content}")
+        results = []
+        for (offset, news_count, social_count), (_, _, economic_indicators) in zip(spans, batches):
+            news_scores = scores[offset:offset + news_count]
+            social_scores = scores[offset + news_count:offset + news_count + social_count]
+            results.append(self.combine_scores(news_scores, social_scores, economic_indicators))
+        return results
+    
+    def prediction_from_signals(self, signals):
+        """(label, confidence) from signals the scoring pipeline attached, or None to score the text
         
-        social_score = self.score_sentiment_batch(social_texts) if social_texts else random.uniform(2.6, 3.4)
+        Stored ML labels only count while the model that produced them is still serving.
+        """
+        if not signals:
+            return None
+        if 'ml_label' in signals and signals.get('ml_version') == self.model_version():
+            return (signals['ml_label'], signals['ml_confidence'])
+        if not self.is_trained and 'vader' in signals:
+            # Same VADER fallback predict_sentiment_many would compute
+            return (self.label_sentiment(signals['vader']), abs(signals['vader']))
+        return None
+    
+    def combine_scores(self, news_scores, social_scores, economic_indicators):
+        """Source and overall scores from model-scored news and social texts plus economic trends"""
+        import random
+        news_score = float(np.mean(news_scores)) if len(news_scores) else random.uniform(2.5, 3.5)
+        social_score = float(np.mean(social_scores)) if len(social_scores) else random.uniform(2.6, 3.4)
         
         # Analyze economic sentiment (simplified approach)
         economic_score = random.uniform(2.7, 3.3)  # Start with dynamic neutral in 2-5 range
@@ -207,6 +330,41 @@ class MarketSentimentPredictor:
             'overall': round(overall_score, 2)
         }
     
+    def warm_start(self, store):
+        """Load models from the artifact store if the training inputs are unchanged"""
+        try:
+            key = store.compute_key(self.training_store().version(), self.hyperparameters)
+            model_data = store.load(key)
+            if model_data is None:
+                print(f"No model artifact for version {key}, training required")
+                return False
+            
+            self.install_models(model_data['vectorizer'], model_data['models'], model_data.get('fast_scorer'), key)
+            print(f"Model artifact {key} loaded")
+            return True
+        
+        except Exception as e:
+            print(f"Error warm starting model: {e}")
+            return False
+    
+    def train_and_store(self, store):
+        """Train models and persist them to the artifact store"""
+        try:
+            key = store.compute_key(self.training_store().version(), self.hyperparameters)
+            self.train_models(version=key)
+            if not self.is_trained:
+                return
+            
+            vectorizer, models, fast_scorer = self.serving_models()
+            store.save(key, {
+                'models': models,
+                'vectorizer': vectorizer,
+                'fast_scorer': fast_scorer,
+                'is_trained': True
+            })
+        except Exception as e:
+            print(f"Error saving model artifact: {e}")
+    
     def save_model(self, filepath):
         """Save trained model to file"""
         if self.is_trained:
@@ -225,9 +383,8 @@ class MarketSentimentPredictor:
             with open(filepath, 'rb') as f:
                 model_data = pickle.load(f)
             
-            self.models = model_data['models']
-            self.vectorizer = model_data['vectorizer'] 
-            self.is_trained = model_data['is_trained']
+            if model_data['is_trained']:
+                self.install_models(model_data['vectorizer'], model_data['models'])
             print(f"Model loaded from {filepath}")
             
         except Exception as e:
@@ -0,0 +1,57 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import joblib
+import sklearn
+
+# Bump when the layout of the saved payload changes
+ARTIFACT_FORMAT_VERSION = 2
+
+
+class ModelArtifactStore:
+    """Versioned on-disk store for trained sentiment models"""
+
+    def __init__(self, root_dir=None):
+        default_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_artifacts')
+        self.root_dir = root_dir or os.getenv('MODEL_ARTIFACT_DIR', default_dir)
+
+    def compute_key(self, data_version, hyperparameters):
+        """Hash the training data version, hyperparameters and library version into an artifact key"""
+        digest = hashlib.sha256(f"data={data_version};".encode('utf-8'))
+        digest.update(json.dumps(hyperparameters, sort_keys=True).encode('utf-8'))
+        digest.update(f"format={ARTIFACT_FORMAT_VERSION};sklearn={sklearn.__version__}".encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def artifact_path(self, key):
+        """Path of the artifact file for a given key"""
+        return os.path.join(self.root_dir, f"sentiment-{key}.joblib")
+
+    def load(self, key):
+        """Load an artifact with its arrays memory-mapped, or None if no artifact matches the key"""
+        path = self.artifact_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            # Read-only mmap shares the plain numpy arrays (linear coefficients, idf weights, the compiled
+            # fast scorer) between workers through the page cache. sklearn trees copy their node arrays into
+            # buffers of their own when unpickled, so each worker still holds a private copy of the forest.
+            return joblib.load(path, mmap_mode='r')
+        except Exception as e:
+            print(f"Error loading model artifact {path}: {e}")
+            return None
+
+    def save(self, key, payload):
+        """Atomically write an artifact so concurrent workers never see a partial file"""
+        os.makedirs(self.root_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            # Uncompressed dump is required for memory-mapped loading
+            joblib.dump(payload, tmp_path)
+            os.replace(tmp_path, self.artifact_path(key))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        print(f"Model artifact saved to {self.artifact_path(key)}")
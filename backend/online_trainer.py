@@ -0,0 +1,148 @@
+import copy
+import os
+import queue
+import tempfile
+import threading
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+
+class OnlineSentimentTrainer:
+    """Incrementally trains a hashing + SGD sentiment model from labelled mini-batches"""
+
+    CLASSES = np.array(['negative', 'neutral', 'positive'])
+
+    def __init__(self, predictor, batch_size=32, n_features=2 ** 16, checkpoint_path=None, checkpoint_every=10,
+                 publish_every=None):
+        self.predictor = predictor
+        self.batch_size = batch_size
+        self.checkpoint_every = checkpoint_every
+        # Publishing clears the predictor's prediction cache, so it happens every few updates, not every one
+        self.publish_every = publish_every or checkpoint_every
+        default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_artifacts', 'online-checkpoint.joblib')
+        self.checkpoint_path = checkpoint_path or os.getenv('ONLINE_CHECKPOINT_PATH', default_path)
+
+        # Stateless vectorizer: no vocabulary to refit as new terms appear
+        self.vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, stop_words='english')
+        self.model = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
+
+        self.updates = 0
+        self.samples_seen = 0
+        self._queue = queue.Queue()
+        self._worker = None
+
+    def start(self):
+        """Resume from the last checkpoint (or bootstrap from history) and start the training worker"""
+        if not self.load_checkpoint():
+            self.bootstrap()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def bootstrap(self):
+        """Seed the model with one pass over the historical training data"""
+        try:
+            df = self.predictor.training_store().load(columns=["title/text", "sentiment"])
+            texts = df["title/text"].astype(str).tolist()
+            labels = [self.predictor.label_sentiment(score) for score in df["sentiment"]]
+            for start in range(0, len(texts), self.batch_size):
+                self.partial_fit(texts[start:start + self.batch_size], labels[start:start + self.batch_size], publish=False)
+            self.publish()
+            print(f"Online model bootstrapped on {len(texts)} samples")
+        except Exception as e:
+            print(f"Error bootstrapping online model: {e}")
+
+    def add_labelled(self, texts, labels):
+        """Queue curated (text, label) pairs for the next mini-batch"""
+        for text, label in zip(texts, labels):
+            if text and label in self.CLASSES:
+                self._queue.put((text, label))
+
+    def add_scored_items(self, symbol, source, items):
+        """Collector observer: label collected items from their lexicon scores"""
+        for item in items:
+            text = f"{item.get('title') or ''} {item.get('description') or item.get('content') or ''}".strip()
+            label = item.get('label')
+            if label is None:
+                score = item.get('raw_sentiment_score', item.get('sentiment_score'))
+                if score is None:
+                    continue
+                label = self.predictor.label_sentiment(score)
+            self.add_labelled([text], [label])
+
+    def partial_fit(self, texts, labels, publish=True):
+        """Update the model on one mini-batch; cost scales with the batch, not the history"""
+        cleaned_texts = [self.predictor.clean_text(text) for text in texts]
+        X = self.vectorizer.transform(cleaned_texts)
+        self.model.partial_fit(X, labels, classes=self.CLASSES)
+        self.updates += 1
+        self.samples_seen += len(labels)
+
+        if publish:
+            if self.updates % self.publish_every == 0:
+                self.publish()
+            if self.updates % self.checkpoint_every == 0:
+                self.save_checkpoint()
+
+    def publish(self):
+        """Swap a frozen copy of the current model into the serving predictor"""
+        checkpoint = copy.deepcopy(self.model)
+        self.predictor.install_models(self.vectorizer, {'online_sgd': checkpoint}, version=f"online-{self.updates}")
+
+    def save_checkpoint(self):
+        """Atomically persist the model so a restart resumes where it left off"""
+        try:
+            directory = os.path.dirname(self.checkpoint_path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            os.close(fd)
+            joblib.dump({'model': self.model, 'vectorizer': self.vectorizer,
+                         'updates': self.updates, 'samples_seen': self.samples_seen}, tmp_path)
+            os.replace(tmp_path, self.checkpoint_path)
+        except Exception as e:
+            print(f"Error saving online checkpoint: {e}")
+
+    def load_checkpoint(self):
+        """Restore the last saved checkpoint, if any"""
+        if not os.path.exists(self.checkpoint_path):
+            return False
+        try:
+            state = joblib.load(self.checkpoint_path)
+            self.model = state['model']
+            self.vectorizer = state['vectorizer']
+            self.updates = state['updates']
+            self.samples_seen = state['samples_seen']
+            self.publish()
+            print(f"Online model resumed from checkpoint ({self.samples_seen} samples)")
+            return True
+        except Exception as e:
+            print(f"Error loading online checkpoint: {e}")
+            return False
+
+    def stats(self):
+        """Training progress for monitoring"""
+        return {
+            'updates': self.updates,
+            'publish_every': self.publish_every,
+            'serving_version': self.predictor.artifact_version,
+            'samples_seen': self.samples_seen,
+            'queued': self._queue.qsize(),
+            'batch_size': self.batch_size
+        }
+
+    def _run(self):
+        """Drain queued items into mini-batches"""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=1))
+                except queue.Empty:
+                    break
+            try:
+                texts, labels = zip(*batch)
+                self.partial_fit(list(texts), list(labels))
+            except Exception as e:
+                print(f"Online training error: {e}")
@@ -0,0 +1,62 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Bounded LRU cache of model predictions with a per-entry TTL"""
+
+    def __init__(self, max_entries=10000, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, cleaned_text, model_version):
+        """Content-addressed key for a cleaned text under a given model version"""
+        return hashlib.sha1(f"{model_version}\x00{cleaned_text}".encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached prediction or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]  # Expired
+            self.misses += 1
+            return None
+
+    def set(self, key, prediction):
+        """Store a prediction, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = (prediction, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached prediction, e.g. when a new model is loaded"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
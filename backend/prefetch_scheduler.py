@@ -0,0 +1,119 @@
+import threading
+import time
+
+
+class PrefetchScheduler:
+    """Refreshes every configured symbol in the background, recently requested symbols first"""
+
+    def __init__(self, symbols, refresh, interval_seconds=45, spacing_seconds=3, recent_window_seconds=900,
+                 max_symbols=50, allowed_symbols=()):
+        self.symbols = list(symbols)
+        self.configured = set(self.symbols)
+        # Requests can add these to the rotation; arbitrary client-supplied tickers never cost upstream calls
+        self.allowed_symbols = self.configured | set(allowed_symbols)
+        self.refresh = refresh
+        self.interval_seconds = interval_seconds
+        self.spacing_seconds = spacing_seconds  # Stagger between upstream refreshes
+        self.recent_window_seconds = recent_window_seconds
+        self.max_symbols = max_symbols
+
+        self._lock = threading.Lock()
+        self._last_requested = {}
+        self._last_refreshed = {}
+        self._last_attempt = {}
+        self._last_duration = {}
+        self._errors = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the background refresh loop"""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the refresh loop after the current refresh"""
+        self._stop.set()
+
+    def record_request(self, symbol):
+        """Note a user request so the symbol is refreshed ahead of idle ones"""
+        if symbol not in self.allowed_symbols:
+            return
+        with self._lock:
+            self._last_requested[symbol] = time.time()
+            if symbol not in self.symbols and len(self.symbols) < self.max_symbols:
+                self.symbols.append(symbol)
+
+    def expire_requested(self, now):
+        """Drop symbols that are only in the rotation because of requests older than the recent window"""
+        expired = [
+            symbol for symbol in self.symbols
+            if symbol not in self.configured and now - self._last_requested.get(symbol, 0) >= self.recent_window_seconds
+        ]
+        for symbol in expired:
+            self.symbols.remove(symbol)
+            for state in (self._last_requested, self._last_refreshed, self._last_attempt, self._last_duration, self._errors):
+                state.pop(symbol, None)
+
+    def next_symbol(self):
+        """Most urgent symbol due for a refresh, or None if all are fresh"""
+        now = time.time()
+        with self._lock:
+            self.expire_requested(now)
+            due = [s for s in self.symbols if now - self._last_attempt.get(s, 0) >= self.interval_seconds]
+            if not due:
+                return None
+
+            def priority(symbol):
+                recently_requested = now - self._last_requested.get(symbol, 0) < self.recent_window_seconds
+                # Recently requested first, then the stalest
+                return (not recently_requested, self._last_refreshed.get(symbol, 0))
+
+            return min(due, key=priority)
+
+    def refresh_symbol(self, symbol):
+        """Refresh one symbol and record its timing"""
+        start = time.time()
+        with self._lock:
+            # Failing symbols also wait a full interval instead of being retried immediately
+            self._last_attempt[symbol] = start
+        try:
+            self.refresh(symbol)
+            with self._lock:
+                self._last_refreshed[symbol] = time.time()
+                self._last_duration[symbol] = time.time() - start
+                self._errors.pop(symbol, None)
+        except Exception as e:
+            print(f"Prefetch failed for {symbol}: {e}")
+            with self._lock:
+                self._errors[symbol] = str(e)
+
+    def stats(self):
+        """Refresh lag per symbol for monitoring"""
+        now = time.time()
+        with self._lock:
+            symbols = {}
+            for symbol in self.symbols:
+                refreshed = self._last_refreshed.get(symbol)
+                requested = self._last_requested.get(symbol)
+                symbols[symbol] = {
+                    'refresh_lag_seconds': round(now - refreshed, 1) if refreshed else None,
+                    'last_refresh_duration_seconds': round(self._last_duration.get(symbol, 0), 3),
+                    'last_requested_seconds_ago': round(now - requested, 1) if requested else None,
+                    'error': self._errors.get(symbol)
+                }
+            lags = [v['refresh_lag_seconds'] for v in symbols.values() if v['refresh_lag_seconds'] is not None]
+            return {
+                'interval_seconds': self.interval_seconds,
+                'spacing_seconds': self.spacing_seconds,
+                'max_refresh_lag_seconds': max(lags) if lags else None,
+                'symbols': symbols
+            }
+
+    def _run(self):
+        while not self._stop.is_set():
+            symbol = self.next_symbol()
+            if symbol is not None:
+                self.refresh_symbol(symbol)
+            # Spacing keeps upstream calls under provider rate limits
+            self._stop.wait(self.spacing_seconds)
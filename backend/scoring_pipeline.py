@@ -0,0 +1,43 @@
+from lexicon_sentiment import LexiconSentimentScorer, textblob_polarity_many
+
+# Every signal the pipeline knows how to compute
+SIGNALS = ('ml', 'vader', 'textblob')
+
+
+class ScoringPipeline:
+    """One batched pass that computes each requested sentiment signal once per text"""
+
+    def __init__(self, predictor=None):
+        self.predictor = predictor
+        self.lexicon_scorer = LexiconSentimentScorer()
+
+    def score_texts(self, texts, signals=SIGNALS):
+        """Signal dicts aligned with `texts`: vader compound, textblob polarity, ml label, confidence and model version"""
+        results = [{} for _ in texts]
+        if not texts:
+            return results
+
+        if 'vader' in signals:
+            for result, score in zip(results, self.lexicon_scorer.compound_many(texts)):
+                result['vader'] = score
+
+        if 'textblob' in signals:
+            for result, score in zip(results, textblob_polarity_many(texts)):
+                result['textblob'] = score
+
+        # Only a trained model adds information; the predictor's own fallback is VADER again
+        if 'ml' in signals and self.predictor is not None and self.predictor.is_trained:
+            # Taken before predicting: a model swapped in mid-batch only makes these labels look stale
+            model_version = self.predictor.model_version()
+            for result, (label, confidence) in zip(results, self.predictor.predict_sentiment_many(texts)):
+                result['ml_label'] = label
+                result['ml_confidence'] = confidence
+                result['ml_version'] = model_version
+
+        return results
+
+    def score_records(self, records, texts, signals=SIGNALS):
+        """Attach the signals of each text to its record under 'signals'"""
+        for record, record_signals in zip(records, self.score_texts(texts, signals)):
+            record['signals'] = record_signals
+        return records
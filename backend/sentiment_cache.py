@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class SymbolCache:
+    """Per-symbol LRU cache with TTL, stale-while-revalidate and single-flight loading"""
+
+    def __init__(self, max_entries=100, ttl_seconds=60, stale_seconds=300, refresh_workers=4):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._inflight = {}  # key -> Future shared by every caller waiting on that key
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='revalidate')
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key, loader):
+        """Return the cached value, serving stale entries while one background load refreshes them"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.monotonic() - entry[1]
+                if age < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                if age < self.ttl_seconds + self.stale_seconds:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    if key not in self._inflight:
+                        future = Future()
+                        self._inflight[key] = future
+                        self._executor.submit(self._load, key, loader, future)
+                    return entry[0]
+                del self._entries[key]  # Too old to serve
+
+            # Miss: the first caller loads, concurrent callers wait on the same future
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if leader:
+            self._load(key, loader, future)
+        return future.result()
+
+    def _load(self, key, loader, future):
+        try:
+            value = loader()
+            self.set(key, value)
+            future.set_result(value)
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def set(self, key, value):
+        """Store a fresh value, evicting the least recently used symbols"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def age(self, key):
+        """Seconds since the entry was stored, or None if absent"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return time.monotonic() - entry[1] if entry is not None else None
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'stale_seconds': self.stale_seconds,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'inflight': len(self._inflight)
+            }
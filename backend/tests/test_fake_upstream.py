@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+pytest.importorskip('praw')
+pytest.importorskip('newsapi')
+pytest.importorskip('vaderSentiment')
+pytest.importorskip('textblob')
+
+from fake_upstream import FakeUpstream, start_server
+from live_data_collector import LiveDataCollector
+
+
+@pytest.fixture
+def upstream_url():
+    """Fake NewsAPI/Reddit/FRED on a free port, without injected latency or failures"""
+    server = start_server(FakeUpstream(seed=7, latency_ms=0, corpus_size=50), port=0)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def collector(upstream_url, tmp_path, monkeypatch):
+    """Collector with every upstream pointed at the fake server and empty local stores"""
+    monkeypatch.chdir(tmp_path)  # No config.env to override the settings below
+    settings = {
+        'NEWS_API_KEY': 'fake',
+        'NEWSAPI_URL': upstream_url,
+        'REDDIT_CLIENT_ID': 'fake',
+        'REDDIT_CLIENT_SECRET': 'fake',
+        'REDDIT_URL': upstream_url,
+        'REDDIT_OAUTH_URL': upstream_url,
+        'FRED_API_KEY': 'fake',
+        'FRED_URL': f"{upstream_url}/fred",
+        'ARTICLE_STORE_DB': str(tmp_path / 'articles.db'),
+        'ECONOMIC_SERIES_DB': str(tmp_path / 'economic_series.db')
+    }
+    for name, value in settings.items():
+        monkeypatch.setenv(name, value)
+    return LiveDataCollector()
+
+
+def test_every_source_is_fetched_from_the_fake_upstream(collector):
+    result = collector.get_comprehensive_sentiment('AAPL', 'Apple Inc')
+
+    assert result['degraded_sources'] == []
+    assert result['stale_sources'] == {}
+    assert result['news_articles']
+    assert result['social_posts']
+    assert result['economic_indicators']
+
+    # Real client paths, not the mock generators
+    http = collector.transport.stats()
+    assert http['newsapi']['requests'] > 0
+    assert http['reddit']['requests'] > 0
+    assert http['fred']['requests'] > 0
+
+
+def test_second_fetch_only_asks_for_newer_articles(collector):
+    collector.get_comprehensive_sentiment('AAPL', 'Apple Inc')
+    result = collector.get_comprehensive_sentiment('AAPL', 'Apple Inc')
+
+    assert result['degraded_sources'] == []
+    assert collector.breaker_stats()['news']['state'] == 'closed'
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+pytest.importorskip('sklearn')
+pytest.importorskip('pandas')
+pytest.importorskip('vaderSentiment')
+pytest.importorskip('textblob')
+
+from fast_scorer import compare_with_sklearn
+from ml_sentiment_predictor import MarketSentimentPredictor
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'market_sentiment_500.csv')
+
+
+@pytest.fixture(scope='module')
+def report(tmp_path_factory):
+    """Parity report of the compiled scorer against the sklearn models, trained once on the historical CSV"""
+    if not os.path.exists(CSV_PATH):
+        pytest.skip('historical CSV not available')
+
+    with pytest.MonkeyPatch.context() as mp:
+        # Keep the Parquet import out of backend/data
+        mp.setenv('HISTORY_STORE_DIR', str(tmp_path_factory.mktemp('history') / 'store'))
+        predictor = MarketSentimentPredictor()
+        mp.setattr(predictor, 'training_data_path', lambda: CSV_PATH)
+        predictor.train_models()
+
+    assert predictor.is_trained
+    assert predictor.fast_scorer is not None, 'fast scorer failed to compile'
+    texts = predictor.training_store().read_csv(CSV_PATH)['title/text'].astype(str).tolist()
+    return compare_with_sklearn(predictor, texts)
+
+
+def test_logistic_regression_matches_sklearn(report):
+    assert report['logistic_max_abs_diff'] < 1e-9
+
+
+def test_distilled_student_agrees_with_forest_ensemble(report):
+    assert report['ensemble_label_agreement'] >= 0.95
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+pytest.importorskip('vaderSentiment')
+pytest.importorskip('textblob')
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from lexicon_sentiment import LexiconSentimentScorer, distinct_texts
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'market_sentiment_500.csv')
+
+# One text per VADER rule the compiled scorer reimplements
+RULE_CASES = [
+    "The earnings were not good",
+    "Revenue isn't great and margins aren't improving",
+    "Never so bad for the stock",
+    "Shares surged incredibly well after the report",
+    "Guidance is slightly better than expected",
+    "Sales were strong but the outlook is terrible",
+    "The launch was fine, but investors are worried, but hopeful",
+    "The results are GREAT despite weak demand",
+    "STOCKS CRASH",
+    "Analysts are kind of optimistic",
+    "This is the least exciting quarter",
+    "At least the dividend is safe",
+    "Profits are without doubt up",
+    "Markets rally!!! Huge gains?",
+    "Tesla beat estimates 🚀😀",
+    "Bank fails 😢",
+    "The merger was the kiss of death for the lender",
+    "",
+    "AAPL 10-Q filed",
+]
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return SentimentIntensityAnalyzer()
+
+
+@pytest.fixture(scope='module')
+def scorer(analyzer):
+    return LexiconSentimentScorer(analyzer)
+
+
+@pytest.fixture(scope='module')
+def headlines():
+    if not os.path.exists(CSV_PATH):
+        pytest.skip('historical CSV not available')
+    pd = pytest.importorskip('pandas')
+    return pd.read_csv(CSV_PATH)['title/text'].astype(str).unique().tolist()
+
+
+@pytest.mark.parametrize('text', RULE_CASES)
+def test_rule_cases_match_vader(scorer, analyzer, text):
+    assert abs(scorer.compound(text) - analyzer.polarity_scores(text)['compound']) <= 1e-3
+
+
+def test_stored_headlines_match_vader(scorer, analyzer, headlines):
+    texts = headlines + distinct_texts(headlines, 2000)
+    for text in texts:
+        assert abs(scorer.compound(text) - analyzer.polarity_scores(text)['compound']) <= 1e-3, text
+
+
+def test_compound_many_matches_compound(scorer):
+    texts = RULE_CASES + RULE_CASES[::-1]
+    assert scorer.compound_many(texts) == [scorer.compound(text) for text in texts]
+
+
+def test_distinct_texts_are_distinct(headlines):
+    texts = distinct_texts(headlines * 3, 1000)
+    assert len(texts) == len(set(texts)) == 1000
@@ -0,0 +1,103 @@
+import json
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Symbol key for market-wide history that has no ticker attached
+MARKET_KEY = '*'
+
+RESOLUTIONS = {
+    'hourly': (pd.offsets.Hour(), '%Y-%m-%d %H:00'),
+    'daily': (pd.offsets.Day(), '%Y-%m-%d'),
+    'weekly': (pd.offsets.Week(weekday=0), '%Y-%m-%d')
+}
+
+
+class TrendStore:
+    """Precomputed 0-100 sentiment trend series per symbol at hourly, daily and weekly resolution"""
+
+    def __init__(self, json_cache_size=256):
+        self.version = 0
+        self._series = {}  # (symbol, resolution) -> (labels, scores)
+        self.json_cache_size = json_cache_size
+        self._json_cache = OrderedDict()  # (series symbol, resolution, points) -> JSON for the current version, LRU
+        self._lock = threading.Lock()
+
+    def rebuild(self, df, symbol=MARKET_KEY):
+        """Resample a timestamp/sentiment frame into every resolution"""
+        hourly = df.set_index('timestamp')['sentiment'].resample(RESOLUTIONS['hourly'][0]).agg(['sum', 'count'])
+        self.rebuild_from_hourly(hourly, symbol)
+
+    def rebuild_from_hourly(self, hourly, symbol=MARKET_KEY):
+        """Build every resolution from hourly sentiment sums and counts with vectorized operations"""
+        series = {}
+        for resolution, (offset, label_format) in RESOLUTIONS.items():
+            closed = 'left' if resolution == 'weekly' else None
+            totals = hourly.resample(offset, closed=closed, label=closed).sum()
+            totals = totals[totals['count'] > 0]
+            means = totals['sum'].to_numpy() / totals['count'].to_numpy()
+            # Convert sentiment from -1,1 to 0,100 scale
+            scores = np.clip((means + 1) * 50, 0, 100).round(2)
+            series[(symbol, resolution)] = (totals.index.strftime(label_format).to_numpy(), scores)
+
+        with self._lock:
+            self._series.update(series)
+            self.version += 1
+            self._json_cache.clear()
+
+    def choose_resolution(self, days):
+        """Hourly detail for short ranges, weekly smoothing for long ones"""
+        if days <= 7:
+            return 'hourly'
+        elif days >= 365:
+            return 'weekly'
+        return 'daily'
+
+    def points_for(self, days, resolution):
+        """Number of points covering the requested range"""
+        if resolution == 'hourly':
+            return days * 24
+        elif resolution == 'weekly':
+            return math.ceil(days / 7)
+        return days
+
+    def _resolve(self, symbol, days, resolution):
+        """Series and point count a request reads, so requests with the same answer share a key
+
+        Unknown symbols read the market series and points are clamped to the series length. Caller holds the lock.
+        """
+        resolution = resolution if resolution in RESOLUTIONS else self.choose_resolution(days)
+        if (symbol, resolution) not in self._series:
+            symbol = MARKET_KEY
+        labels, _ = self._series.get((symbol, resolution), (np.array([]), np.array([])))
+        points = min(max(0, self.points_for(days, resolution)), len(labels))
+        return symbol, resolution, points
+
+    def query(self, symbol, days, resolution=None):
+        """Trend points for the last N days, answered by slicing the precomputed arrays"""
+        with self._lock:
+            symbol, resolution, points = self._resolve(symbol, days, resolution)
+            labels, scores = self._series.get((symbol, resolution), (np.array([]), np.array([])))
+        start = len(labels) - points  # Never negative: points is clamped to the series length
+        labels, scores = labels[start:], scores[start:]
+        return [{'date': label, 'score': float(score)} for label, score in zip(labels.tolist(), scores.tolist())]
+
+    def query_json(self, symbol, days, resolution=None):
+        """Serialized trend, cached until the underlying series change"""
+        with self._lock:
+            key = self._resolve(symbol, days, resolution)
+            cached = self._json_cache.get(key)
+            if cached is not None:
+                self._json_cache.move_to_end(key)
+                return cached
+            version = self.version
+        body = json.dumps(self.query(symbol, days, resolution))
+        with self._lock:
+            if self.version == version:  # Skip bodies built from series a rebuild has since replaced
+                self._json_cache[key] = body
+                while len(self._json_cache) > self.json_cache_size:
+                    self._json_cache.popitem(last=False)
+        return body
@@ -0,0 +1,158 @@
+import heapq
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+
+# Simple word extraction (remove common words)
+STOP_WORDS = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'as', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should'}
+WORD_PATTERN = re.compile(r'\b[a-zA-Z]{4,}\b')
+
+# Sliding windows as (total span, number of buckets in the ring)
+WINDOWS = {
+    '1h': (3600, 12),
+    '24h': (86400, 24),
+    '7d': (7 * 86400, 7)
+}
+
+# Symbol key for terms across every symbol
+ALL_SYMBOLS = '*'
+
+
+def extract_terms(text):
+    """Lowercased words of four or more letters, minus stop words"""
+    return [word for word in WORD_PATTERN.findall(text.lower()) if word not in STOP_WORDS]
+
+
+def published_timestamp(item):
+    """Epoch seconds an article or post was published, or None if it carries no usable time"""
+    if item.get('publishedAt'):
+        try:
+            published = datetime.fromisoformat(item['publishedAt'].replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        if published.tzinfo is None:
+            published = published.replace(tzinfo=timezone.utc)  # Naive times are UTC, as in the historical data
+        return published.timestamp()
+    return item.get('created_utc')
+
+
+class SpaceSaving:
+    """Space-Saving heavy-hitter counter holding at most `capacity` terms"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self._heap = []  # (count, term) with lazily discarded stale entries
+
+    def add(self, term, weight=1):
+        if term in self.counts:
+            self.counts[term] += weight
+        elif len(self.counts) < self.capacity:
+            self.counts[term] = weight
+        else:
+            # Replace the current minimum; the newcomer inherits its count as overestimate
+            while True:
+                count, victim = heapq.heappop(self._heap)
+                if self.counts.get(victim) == count:
+                    break
+            del self.counts[victim]
+            self.counts[term] = count + weight
+        heapq.heappush(self._heap, (self.counts[term], term))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, t) for t, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+
+class WindowedTermTracker:
+    """Top terms per symbol over 1h/24h/7d sliding windows with bounded memory"""
+
+    def __init__(self, capacity=200, max_symbols=100):
+        self.capacity = capacity
+        self.max_symbols = max_symbols
+        self._symbols = OrderedDict()  # symbol -> {window: deque of (bucket_start, SpaceSaving)}
+        self._top_cache = {}  # (symbol, window, n) -> (expires_at, terms)
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def ingest(self, symbol, text, timestamp=None):
+        """Count the terms of one title, published at `timestamp`, for the symbol and the all-symbol view"""
+        terms = extract_terms(text or '')
+        if not terms:
+            return
+        now = time.time()
+        timestamp = min(timestamp or now, now)  # Clock skew must not open buckets in the future
+        with self._lock:
+            for key in (symbol, ALL_SYMBOLS):
+                windows = self._windows_locked(key)
+                for window, (span, buckets) in WINDOWS.items():
+                    bucket = self._bucket_locked(windows[window], timestamp, span // buckets, span, now)
+                    if bucket is None:
+                        continue  # Published before this window
+                    for term in terms:
+                        bucket.add(term)
+            self._top_cache.clear()
+            self.version += 1
+
+    def add_live_items(self, symbol, source, items):
+        """Collector observer: ingest news titles at the time they were published"""
+        if source != 'news':
+            return
+        for item in items:
+            self.ingest(symbol, item.get('title'), published_timestamp(item))
+
+    def _windows_locked(self, symbol):
+        windows = self._symbols.get(symbol)
+        if windows is None:
+            windows = {window: deque() for window in WINDOWS}
+            self._symbols[symbol] = windows
+            while len(self._symbols) > self.max_symbols:
+                self._symbols.popitem(last=False)
+        self._symbols.move_to_end(symbol)
+        return windows
+
+    def _bucket_locked(self, ring, timestamp, bucket_span, span, now):
+        """Sketch of the bucket covering `timestamp`, or None once it has left the window"""
+        while ring and ring[0][0] <= now - span:
+            ring.popleft()  # Expired buckets fall out of the window
+        if timestamp <= now - span:
+            return None
+        bucket_start = timestamp - timestamp % bucket_span
+        # Buckets stay ordered by start; most titles land in the newest one, so search from the right
+        position = len(ring)
+        while position and ring[position - 1][0] > bucket_start:
+            position -= 1
+        if position and ring[position - 1][0] == bucket_start:
+            return ring[position - 1][1]
+        sketch = SpaceSaving(self.capacity)
+        ring.insert(position, (bucket_start, sketch))
+        return sketch
+
+    def window_epoch(self, window, now=None):
+        """Index of the window's current bucket; top terms can only change when it or `version` moves"""
+        span, buckets = WINDOWS[window]
+        return int((now or time.time()) // (span // buckets))
+
+    def top_terms(self, symbol, window='24h', n=20):
+        """[(term, count)] for the window; merges at most one ring of bounded sketches"""
+        span, buckets = WINDOWS[window]
+        now = time.time()
+        key = (symbol, window, n)
+        with self._lock:
+            cached = self._top_cache.get(key)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+
+            totals = {}
+            ring = self._symbols.get(symbol, {}).get(window, ())
+            for bucket_start, sketch in ring:
+                if bucket_start > now - span:
+                    for term, count in sketch.counts.items():
+                        totals[term] = totals.get(term, 0) + count
+            terms = heapq.nlargest(n, totals.items(), key=lambda item: item[1])
+
+            # Valid until the oldest bucket rolls out of the window or new titles arrive
+            bucket_span = span // buckets
+            self._top_cache[key] = (now - now % bucket_span + bucket_span, terms)
+            return terms
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import {
   LineChart,
   Line,
@@ -85,6 +85,9 @@ function generateMockNews(count = 6) {
   return news;
 }
 
+// Browsers without server-sent events, and symbols the server does not push, poll on the auto refresh interval instead
+const SUPPORTS_STREAMING = typeof EventSource !== "undefined";
+
 export default function MarketSentimentDashboard() {
   const [symbol, setSymbol] = useState("AAPL");
   const [trendRange, setTrendRange] = useState("30");
@@ -93,6 +96,7 @@ export default function MarketSentimentDashboard() {
   const [news, setNews] = useState(generateMockNews());
   const [wordCloud, setWordCloud] = useState(MOCK_WORDS);
   const [intervalMins, setIntervalMins] = useState(30);
+  const [isStreaming, setIsStreaming] = useState(SUPPORTS_STREAMING);
   const [lastUpdated, setLastUpdated] = useState(new Date());
   const [companies, setCompanies] = useState([]);
   const [showDropdown, setShowDropdown] = useState(false);
@@ -104,6 +108,9 @@ export default function MarketSentimentDashboard() {
       "Mock recommendation: The model sees balanced news and social signals, resulting in a neutral stance.",
   });
   const [isLoading, setIsLoading] = useState(false);
+  // Read by the stream handler without reconnecting whenever the range changes
+  const trendRangeRef = useRef(trendRange);
+  trendRangeRef.current = trendRange;
 
   async function fetchSentimentData(inputSymbol) {
     setIsLoading(true);
@@ -111,30 +118,18 @@ export default function MarketSentimentDashboard() {
     try {
       const baseURL = 'http://localhost:5000/api';
       
-      // Fetch sentiment data
-      const sentimentResponse = await fetch(`${baseURL}/sentiment/${inputSymbol}`);
-      const sentimentData = await sentimentResponse.json();
-      setSentiment(sentimentData);
-      
-      // Fetch trend data
-      const trendResponse = await fetch(`${baseURL}/trend/${inputSymbol}?days=${trendRange}`);
-      const trendData = await trendResponse.json();
-      setTrendData(trendData);
-      
-      // Fetch news data
-      const newsResponse = await fetch(`${baseURL}/news?count=8`);
-      const newsData = await newsResponse.json();
-      setNews(newsData);
-      
-      // Fetch word cloud data
-      const wordCloudResponse = await fetch(`${baseURL}/wordcloud`);
-      const wordCloudData = await wordCloudResponse.json();
-      setWordCloud(wordCloudData);
+      // Fetch every section from one consistent server-side snapshot
+      const response = await fetch(`${baseURL}/dashboard/${inputSymbol}?days=${trendRange}&news=8&window=24h`);
+      if (!response.ok) {
+        throw new Error(`Dashboard request failed: ${response.status}`);
+      }
+      const dashboard = await response.json();
       
-      // Fetch recommendation
-      const recommendationResponse = await fetch(`${baseURL}/recommendation/${inputSymbol}`);
-      const recommendationData = await recommendationResponse.json();
-      setRecommendation(recommendationData);
+      setSentiment(dashboard.sentiment);
+      setTrendData(dashboard.trend);
+      setNews(dashboard.news);
+      setWordCloud(dashboard.wordcloud);
+      setRecommendation(dashboard.recommendation);
       
       setLastUpdated(new Date());
       
@@ -201,12 +196,42 @@ export default function MarketSentimentDashboard() {
   }
 
   useEffect(() => {
-    fetchSentimentData(symbol);
+    if (isStreaming) return undefined;
+    // Polling fallback while the stream is unavailable or does not cover this symbol
     const refreshMs = intervalMins * 60 * 1000;
     const id = setInterval(() => fetchSentimentData(symbol), refreshMs);
     return () => clearInterval(id);
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [intervalMins]);
+  }, [symbol, intervalMins, isStreaming]);
+
+  useEffect(() => {
+    if (!SUPPORTS_STREAMING) return undefined;
+    setIsStreaming(true);
+
+    // Server pushes changed sections after each background refresh; the browser
+    // reconnects with Last-Event-ID on its own
+    const source = new EventSource(`http://localhost:5000/api/stream/${symbol}`);
+    // First event says whether the server refreshes this symbol in the background
+    source.addEventListener("status", (event) => {
+      const { live } = JSON.parse(event.data);
+      setIsStreaming(live);
+      if (!live) source.close();
+    });
+    const applyUpdate = (event) => {
+      const update = JSON.parse(event.data);
+      if (update.sentiment) setSentiment(update.sentiment);
+      // Trend is pushed for every selectable range; show the one on screen
+      if (update.trend && update.trend[trendRangeRef.current]) setTrendData(update.trend[trendRangeRef.current]);
+      if (update.news) setNews(update.news);
+      if (update.wordcloud) setWordCloud(update.wordcloud);
+      if (update.recommendation) setRecommendation(update.recommendation);
+      setLastUpdated(new Date());
+    };
+    source.addEventListener("snapshot", applyUpdate);
+    source.addEventListener("update", applyUpdate);
+    return () => source.close();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [symbol]);
 
   useEffect(() => {
     fetchSentimentData(symbol);
@@ -313,16 +338,18 @@ export default function MarketSentimentDashboard() {
             >
               Analyze
             </button>
-            <select
-              value={intervalMins}
-              onChange={(e) => setIntervalMins(+e.target.value)}
-              className={`hidden sm:inline-block px-3 py-2 ${themeClasses.card} ${themeClasses.input} border rounded-lg`}
-            >
-              <option value={5}>5 min</option>
-              <option value={15}>15 min</option>
-              <option value={30}>30 min</option>
-              <option value={60}>60 min</option>
-            </select>
+            {!isStreaming && (
+              <select
+                value={intervalMins}
+                onChange={(e) => setIntervalMins(+e.target.value)}
+                className={`hidden sm:inline-block px-3 py-2 ${themeClasses.card} ${themeClasses.input} border rounded-lg`}
+              >
+                <option value={5}>5 min</option>
+                <option value={15}>15 min</option>
+                <option value={30}>30 min</option>
+                <option value={60}>60 min</option>
+              </select>
+            )}
           </form>
           </div>
         </motion.header>
@@ -380,7 +407,9 @@ export default function MarketSentimentDashboard() {
                     <RefreshCw className="w-4 h-4" /> Refresh Now
                   </button>
 
-                  <div className={`text-sm ${themeClasses.text.secondary}`}>Auto refresh: {intervalMins} min</div>
+                  <div className={`text-sm ${themeClasses.text.secondary}`}>
+                    {isStreaming ? "Live updates" : `Auto refresh: ${intervalMins} min`}
+                  </div>
                 </div>
               </div>
 